@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Throughput of the bulk comment import against one-at-a-time POST /comments.
+
+Runs the comment-service app in-process against its DATABASE_URL, imports a
+generated NDJSON thread (roots with nested replies) through POST
+/comments/bulk, then posts a smaller sample through POST /comments, and
+reports rows/sec for both. The bulk rows go to a post seeded for the bench
+user, since only a post's author may import. Seeded rows are deleted
+afterwards.
+
+Usage:
+    python scripts/bench_bulk_comments.py --rows 20000 --baseline-rows 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "services", "comment-service")
+)
+
+import httpx  # noqa: E402
+from jose import jwt  # noqa: E402
+from sqlalchemy import delete, text  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Comment, PostCommentStats  # noqa: E402
+
+
+def ndjson_thread(post_id: uuid.UUID, rows: int) -> bytes:
+    lines = []
+    for i in range(rows):
+        parent = random.randrange(i) if i and random.random() < 0.7 else None
+        item = {"client_id": str(i), "post_id": str(post_id), "content": f"c{i}"}
+        if parent is not None:
+            item["parent_client_id"] = str(parent)
+        lines.append(json.dumps(item))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def seed_post(author_id: uuid.UUID) -> uuid.UUID:
+    post_id = uuid.uuid4()
+    async with SessionLocal() as db:
+        await db.execute(
+            text(
+                "INSERT INTO posts.posts (id, author_id, title, slug, content, status) "
+                "VALUES (:id, :author_id, 'Bulk bench', :slug, 'Bulk bench', "
+                "'published')"
+            ),
+            {"id": post_id, "author_id": author_id, "slug": f"bulk-bench-{post_id}"},
+        )
+        await db.commit()
+    return post_id
+
+
+async def bench_bulk(client, headers, post_id: uuid.UUID, rows: int):
+    body = ndjson_thread(post_id, rows)
+    start = time.perf_counter()
+    response = await client.post("/comments/bulk", content=body, headers=headers)
+    elapsed = time.perf_counter() - start
+    data = response.json()["data"]
+    print(
+        f"bulk:     {data['created']} created, {data['failed']} failed "
+        f"in {elapsed:.2f}s -> {data['created'] / elapsed:.0f} rows/s"
+    )
+    return post_id
+
+
+async def bench_single(client, headers, rows: int) -> float:
+    post_id = uuid.uuid4()
+    start = time.perf_counter()
+    for i in range(rows):
+        await client.post(
+            f"/comments/post/{post_id}", json={"content": f"c{i}"}, headers=headers
+        )
+    elapsed = time.perf_counter() - start
+    print(f"single:   {rows} created in {elapsed:.2f}s -> {rows / elapsed:.0f} rows/s")
+    return post_id
+
+
+async def run(rows: int, baseline_rows: int):
+    user_id = uuid.uuid4()
+    token = jwt.encode(
+        {"sub": str(user_id), "type": "access"},
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    bulk_post_id = await seed_post(user_id)
+    post_ids = []
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            app=app, base_url="http://bench", timeout=None
+        ) as client:
+            post_ids.append(await bench_bulk(client, headers, bulk_post_id, rows))
+            if baseline_rows:
+                post_ids.append(await bench_single(client, headers, baseline_rows))
+
+    async with SessionLocal() as db:
+        await db.execute(delete(Comment).where(Comment.post_id.in_(post_ids)))
+        await db.execute(
+            delete(PostCommentStats).where(PostCommentStats.post_id.in_(post_ids))
+        )
+        await db.execute(
+            text("DELETE FROM posts.posts WHERE id = :id"), {"id": bulk_post_id}
+        )
+        await db.commit()
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--baseline-rows", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.baseline_rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Latency of CommentService.build_comment_tree as a thread grows.
+
+Seeds a throwaway thread per reply count (replies spread over five levels),
+times building the tree and counts the SQL statements issued, then deletes
+the seeded rows. Uses the comment-service DATABASE_URL.
+
+Usage:
+    python scripts/bench_comment_tree.py --replies 10 100 500 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "services", "comment-service")
+)
+
+from sqlalchemy import delete, event  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.models import Comment  # noqa: E402
+from app.services.comment_service import CommentService, path_segment  # noqa: E402
+
+statements = 0
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def count_statement(*args):
+    global statements
+    statements += 1
+
+
+def new_comment(post_id, author_id, parent=None, content="") -> Comment:
+    comment_id = uuid.uuid4()
+    created_at = datetime.utcnow()
+    segment = path_segment(created_at, comment_id)
+    return Comment(
+        id=comment_id,
+        post_id=post_id,
+        author_id=author_id,
+        parent_id=parent.id if parent else None,
+        content=content,
+        created_at=created_at,
+        path=f"{parent.path}.{segment}" if parent else segment,
+        depth=parent.depth + 1 if parent else 0,
+    )
+
+
+async def seed_thread(db, post_id, replies: int) -> Comment:
+    author_id = uuid.uuid4()
+    root = new_comment(post_id, author_id, content="root")
+    db.add(root)
+
+    levels = [[root]]
+    for i in range(replies):
+        depth = min(len(levels), random.randint(1, 5))
+        parent = random.choice(levels[depth - 1])
+        reply = new_comment(post_id, author_id, parent, f"reply {i}")
+        db.add(reply)
+        if depth == len(levels):
+            levels.append([])
+        levels[depth].append(reply)
+    await db.commit()
+    return root
+
+
+async def run(reply_counts, repeats):
+    global statements
+    print(f"{'replies':>8}  {'queries':>7}  {'ms (median)':>11}")
+    for replies in reply_counts:
+        post_id = uuid.uuid4()
+        async with SessionLocal() as db:
+            root = await seed_thread(db, post_id, replies)
+            service = CommentService(db)
+
+            timings = []
+            for _ in range(repeats):
+                statements = 0
+                start = time.perf_counter()
+                await service.build_comment_tree(root)
+                timings.append((time.perf_counter() - start) * 1000)
+                queries = statements
+
+            await db.execute(delete(Comment).where(Comment.post_id == post_id))
+            await db.commit()
+
+        timings.sort()
+        print(f"{replies:>8}  {queries:>7}  {timings[len(timings) // 2]:>11.1f}")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--replies", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.replies, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Cost of signing and verifying access tokens with HS256 versus ES256.
+
+Generates a throwaway P-256 key and HMAC secret, then times python-jose
+signing and verification of a typical access token on one core. ES256
+verification is timed both with a prebuilt key object, as the services keep
+keys fetched from the JWKS, and with the key parsed from PEM on every call.
+
+Usage:
+    python scripts/bench_jwt_verify.py --iterations 2000
+"""
+import argparse
+import secrets
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk, jwt
+
+
+def per_second(func, iterations: int) -> float:
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    claims = {
+        "sub": str(uuid.uuid4()),
+        "email": "bench@example.com",
+        "type": "access",
+        "exp": datetime.utcnow() + timedelta(minutes=30),
+    }
+    secret = secrets.token_urlsafe(32)
+    private_pem = (
+        ec.generate_private_key(ec.SECP256R1())
+        .private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        .decode("ascii")
+    )
+    private_key = jwk.construct(private_pem, "ES256")
+    public_key = private_key.public_key()
+    public_pem = public_key.to_pem().decode("ascii")
+
+    hs_token = jwt.encode(claims, secret, algorithm="HS256")
+    es_token = jwt.encode(claims, private_key, algorithm="ES256")
+
+    results = [
+        ("HS256 sign", lambda: jwt.encode(claims, secret, algorithm="HS256")),
+        ("HS256 verify", lambda: jwt.decode(hs_token, secret, algorithms=["HS256"])),
+        ("ES256 sign", lambda: jwt.encode(claims, private_key, algorithm="ES256")),
+        (
+            "ES256 verify (prebuilt key)",
+            lambda: jwt.decode(es_token, public_key, algorithms=["ES256"]),
+        ),
+        (
+            "ES256 verify (PEM per call)",
+            lambda: jwt.decode(es_token, public_pem, algorithms=["ES256"]),
+        ),
+    ]
+
+    print(f"token sizes: HS256 {len(hs_token)} bytes, ES256 {len(es_token)} bytes")
+    print(f"{'operation':<28}  {'ops/s':>9}  {'us/op':>8}")
+    for name, func in results:
+        rate = per_second(func, args.iterations)
+        print(f"{name:<28}  {rate:>9.0f}  {1e6 / rate:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+bcrypt cost calibration for PASSWORD_HASH_ROUNDS.
+
+For each candidate cost, times bcrypt on a single thread (hashes/sec per core)
+and across all cores at once, so the cost can be picked against the login
+throughput budget of an auth-service task.
+
+Usage:
+    python scripts/calibrate_bcrypt.py --rounds 10 11 12 13 14 --samples 8
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+PASSWORD = b"calibration-password"
+
+
+def hash_once(rounds: int) -> None:
+    bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds=rounds))
+
+
+def single_core_rate(rounds: int, samples: int) -> float:
+    start = time.perf_counter()
+    for _ in range(samples):
+        hash_once(rounds)
+    return samples / (time.perf_counter() - start)
+
+
+def all_cores_rate(rounds: int, samples: int, workers: int) -> float:
+    # bcrypt releases the GIL, so threads scale across cores
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start = time.perf_counter()
+        list(executor.map(hash_once, [rounds] * samples * workers))
+        elapsed = time.perf_counter() - start
+    return samples * workers / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument(
+        "--samples", type=int, default=8, help="Hashes per core per cost"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"{args.workers} cores")
+    print(f"{'rounds':>6}  {'ms/hash':>8}  {'hash/s/core':>11}  {'hash/s total':>12}")
+    for rounds in args.rounds:
+        hash_once(rounds)  # warm up
+        per_core = single_core_rate(rounds, args.samples)
+        total = all_cores_rate(rounds, args.samples, args.workers)
+        print(
+            f"{rounds:>6}  {1000 / per_core:>8.1f}  {per_core:>11.2f}  {total:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
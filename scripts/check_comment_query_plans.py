@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN regression check for the comment service's hot queries.
+
+Runs each CommentService read against a throwaway thread, captures the SQL it
+issues and re-runs it under EXPLAIN with sequential and bitmap scans disabled.
+Fails (exit 1) if a query still needs a Seq Scan, meaning no index matches its
+predicates, or a Sort where an index should already provide the order.
+Run it against a migrated database, e.g. in CI after init-db.sh.
+
+Usage:
+    python scripts/check_comment_query_plans.py
+"""
+import asyncio
+import json
+import os
+import sys
+import uuid
+from datetime import datetime
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "services", "comment-service")
+)
+
+from sqlalchemy import delete, event  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.models import Comment, PostCommentStats  # noqa: E402
+from app.services.comment_service import CommentService, path_segment  # noqa: E402
+
+
+def new_comment(post_id, parent=None) -> Comment:
+    comment_id = uuid.uuid4()
+    created_at = datetime.utcnow()
+    segment = path_segment(created_at, comment_id)
+    return Comment(
+        id=comment_id,
+        post_id=post_id,
+        author_id=uuid.uuid4(),
+        parent_id=parent.id if parent else None,
+        content="plan check",
+        created_at=created_at,
+        path=f"{parent.path}.{segment}" if parent else segment,
+        depth=parent.depth + 1 if parent else 0,
+    )
+
+
+def hot_queries(service: CommentService, post_id, root):
+    # (name, call, sort allowed)
+    return [
+        ("top-level page", lambda: service.get_by_post(post_id), False),
+        # Window over several parents needs a sort until Postgres can merge
+        # ordered index scans across an IN list
+        ("threads with previews", lambda: service.get_threads_by_post(post_id), True),
+        ("subtree", lambda: service.build_comment_tree(root), False),
+        ("thread order", lambda: service.get_thread_ordered(post_id), False),
+        ("all comments", lambda: service.get_all_comments_by_post(post_id), False),
+        ("batch counts", lambda: service.get_comment_counts([post_id]), False),
+    ]
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def capture(call) -> list:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        await call()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+async def explain(statement: str, parameters) -> dict:
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        await conn.exec_driver_sql("SET enable_bitmapscan = off")
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar()
+        await conn.rollback()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+
+async def run() -> int:
+    post_id = uuid.uuid4()
+    failures = 0
+    async with SessionLocal() as db:
+        root = new_comment(post_id)
+        replies = [new_comment(post_id, root) for _ in range(3)]
+        db.add_all([root, *replies, new_comment(post_id, replies[0])])
+        db.add(PostCommentStats(post_id=post_id, comment_count=5))
+        await db.commit()
+
+        try:
+            service = CommentService(db)
+            for name, call, allow_sort in hot_queries(service, post_id, root):
+                for statement, parameters in await capture(call):
+                    nodes = list(plan_nodes(await explain(statement, parameters)))
+                    problems = [
+                        node["Node Type"]
+                        for node in nodes
+                        if node["Node Type"] == "Seq Scan"
+                        or (node["Node Type"] == "Sort" and not allow_sort)
+                    ]
+                    indexes = sorted(
+                        {node["Index Name"] for node in nodes if "Index Name" in node}
+                    )
+                    status = "FAIL" if problems else "ok"
+                    print(f"{status:4}  {name}: {', '.join(problems or indexes)}")
+                    failures += bool(problems)
+        finally:
+            await db.execute(delete(Comment).where(Comment.post_id == post_id))
+            await db.execute(
+                delete(PostCommentStats).where(PostCommentStats.post_id == post_id)
+            )
+            await db.commit()
+
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run()))
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Concurrency check for like/unlike toggles.
+
+Runs the like-service app in-process against its DATABASE_URL, seeds a
+throwaway post, then for each of several users fires a burst of concurrent
+like and unlike requests. Fails (exit 1) if any request errors with a 5xx,
+if more than one concurrent like succeeds for the same user, or if the final
+like count does not match the rows left behind. Seeded rows are deleted
+afterwards.
+
+Usage:
+    python scripts/check_like_toggle_race.py --users 20 --burst 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import uuid
+from collections import Counter
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "services", "like-service")
+)
+
+import httpx  # noqa: E402
+from jose import jwt  # noqa: E402
+from sqlalchemy import delete, func, select  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Like, Post, PostLikeCount  # noqa: E402
+
+settings = get_settings()
+
+
+def auth_headers(user_id: uuid.UUID) -> dict:
+    token = jwt.encode(
+        {"sub": str(user_id), "type": "access"},
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def toggle(client, slug: str, headers: dict, like: bool) -> int:
+    if like:
+        response = await client.post(
+            "/likes/", json={"post_slug": slug}, headers=headers
+        )
+    else:
+        response = await client.delete(f"/likes/{slug}", headers=headers)
+    return response.status_code
+
+
+async def run(users: int, burst: int) -> int:
+    post = Post(
+        author_id=uuid.uuid4(),
+        title="Like race check",
+        slug=f"like-race-{uuid.uuid4().hex[:12]}",
+        content="like race check",
+        status="published",
+    )
+    async with SessionLocal() as db:
+        db.add(post)
+        await db.commit()
+
+    failures = 0
+    try:
+        async with app.router.lifespan_context(app):
+            # Unhandled errors come back as 500s instead of aborting the run
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://check", timeout=None
+            ) as client:
+                # Every user first races `burst` identical likes: exactly one
+                # may win, the rest must see 409
+                user_ids = [uuid.uuid4() for _ in range(users)]
+                statuses = await asyncio.gather(
+                    *(
+                        toggle(client, post.slug, auth_headers(user_id), True)
+                        for user_id in user_ids
+                        for _ in range(burst)
+                    )
+                )
+                for i, user_id in enumerate(user_ids):
+                    counts = Counter(statuses[i * burst : (i + 1) * burst])
+                    if counts[200] != 1 or set(counts) - {200, 409}:
+                        print(f"FAIL  double like for {user_id}: {dict(counts)}")
+                        failures += 1
+
+                # Then mixed likes and unlikes in random order
+                calls = [
+                    (user_id, random.random() < 0.5)
+                    for user_id in user_ids
+                    for _ in range(burst)
+                ]
+                random.shuffle(calls)
+                statuses = await asyncio.gather(
+                    *(
+                        toggle(client, post.slug, auth_headers(user_id), like)
+                        for user_id, like in calls
+                    )
+                )
+                errors = [code for code in statuses if code >= 500]
+                if errors:
+                    print(f"FAIL  {len(errors)} of {len(statuses)} toggles errored")
+                    failures += 1
+
+                response = await client.get(
+                    "/likes/count", params={"post_slug": post.slug}
+                )
+                reported = response.json()["data"]["count"]
+
+        async with SessionLocal() as db:
+            rows = await db.scalar(
+                select(func.count(Like.id)).where(Like.post_id == post.id)
+            )
+            per_user = await db.scalar(
+                select(func.count(func.distinct(Like.user_id))).where(
+                    Like.post_id == post.id
+                )
+            )
+        if reported != rows or rows != per_user:
+            print(f"FAIL  count {reported}, rows {rows}, distinct users {per_user}")
+            failures += 1
+        print(
+            f"{'FAIL' if failures else 'ok':4}  {users} users x {burst} toggles, "
+            f"{rows} likes left"
+        )
+    finally:
+        async with SessionLocal() as db:
+            await db.execute(delete(Like).where(Like.post_id == post.id))
+            await db.execute(
+                delete(PostLikeCount).where(PostLikeCount.post_id == post.id)
+            )
+            await db.execute(delete(Post).where(Post.id == post.id))
+            await db.commit()
+        await engine.dispose()
+
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--burst", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.users, args.burst)))
+
+
+if __name__ == "__main__":
+    main()
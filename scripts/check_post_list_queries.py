@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Statement-count check for the post service's listing queries.
+
+Seeds a throwaway author with tagged published posts, then lists them with
+a small and a large page size through list_posts (plain, by tag and with
+full-text search) and get_posts_by_author. Fails (exit 1) if a listing
+issues more SQL statements for the large page than for the small one,
+meaning tags or authors are being loaded per post again. Seeded rows are
+deleted afterwards. Uses the post-service DATABASE_URL.
+
+Usage:
+    python scripts/check_post_list_queries.py --posts 120 --limits 5 100
+"""
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "services", "post-service")
+)
+
+from sqlalchemy import delete, event  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.models import Post, Tag  # noqa: E402
+from app.services.post_service import get_posts_by_author, list_posts  # noqa: E402
+from app.services.search_service import build_search_vector  # noqa: E402
+
+statements = 0
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def count_statement(*args):
+    global statements
+    statements += 1
+
+
+def listings(author_id: uuid.UUID, tag: str):
+    return [
+        (
+            "list_posts",
+            lambda db, limit: list_posts(db, author_id=author_id, limit=limit),
+        ),
+        (
+            "list_posts by tag",
+            lambda db, limit: list_posts(db, author_id=author_id, tag=tag, limit=limit),
+        ),
+        (
+            "list_posts search",
+            lambda db, limit: list_posts(
+                db, author_id=author_id, search="statementcheck", limit=limit
+            ),
+        ),
+        (
+            "get_posts_by_author",
+            lambda db, limit: get_posts_by_author(db, author_id, limit=limit),
+        ),
+    ]
+
+
+async def count_statements(call, limit: int) -> tuple:
+    global statements
+    # A fresh session per call so nothing is served from the identity map
+    async with SessionLocal() as db:
+        statements = 0
+        results, _, _ = await call(db, limit)
+        return statements, len(results)
+
+
+async def run(posts: int, limits: list) -> int:
+    author_id = uuid.uuid4()
+    suffix = uuid.uuid4().hex[:8]
+    tags = [Tag(name=f"check-{i}-{suffix}", slug=f"check-{i}-{suffix}") for i in (1, 2)]
+    async with SessionLocal() as db:
+        db.add_all(tags)
+        for i in range(posts):
+            title = f"Statement check {i}"
+            content = "statementcheck listing content"
+            db.add(
+                Post(
+                    author_id=author_id,
+                    title=title,
+                    slug=f"statement-check-{suffix}-{i}",
+                    content=content,
+                    summary="statement check",
+                    status="published",
+                    tags=list(tags),
+                    search_vector=build_search_vector(title, None, content),
+                )
+            )
+        await db.commit()
+
+    failures = 0
+    try:
+        print(f"{'listing':<22}" + "".join(f"  {f'limit {n}':>10}" for n in limits))
+        for name, call in listings(author_id, tags[0].name):
+            counts = []
+            for limit in limits:
+                counted, rows = await count_statements(call, limit)
+                if rows != min(limit, posts):
+                    print(f"FAIL  {name}: {rows} rows for limit {limit}")
+                    failures += 1
+                counts.append(counted)
+            status = "FAIL" if len(set(counts)) > 1 else "ok"
+            failures += status == "FAIL"
+            print(
+                f"{name:<22}"
+                + "".join(f"  {count:>10}" for count in counts)
+                + f"  {status}"
+            )
+    finally:
+        async with SessionLocal() as db:
+            await db.execute(delete(Post).where(Post.author_id == author_id))
+            await db.execute(delete(Tag).where(Tag.id.in_([tag.id for tag in tags])))
+            await db.commit()
+        await engine.dispose()
+
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=120)
+    parser.add_argument("--limits", type=int, nargs="+", default=[5, 100])
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.posts, args.limits)))
+
+
+if __name__ == "__main__":
+    main()
@@ -34,9 +34,10 @@ psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-E
     CREATE TABLE IF NOT EXISTS auth.refresh_tokens (
         id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
         user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
-        token VARCHAR(255) UNIQUE NOT NULL,
+        token_hash BYTEA NOT NULL,
         expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
         created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        rotated_at TIMESTAMP WITH TIME ZONE,
         revoked_at TIMESTAMP WITH TIME ZONE
     );
     
@@ -51,6 +52,13 @@ psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-E
         updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
     );
     
+    CREATE TABLE IF NOT EXISTS users.profile_events (
+        id BIGSERIAL PRIMARY KEY,
+        user_id UUID NOT NULL,
+        event_type VARCHAR(50) NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    );
+    
     -- Post Service Tables
     CREATE TABLE IF NOT EXISTS posts.posts (
         id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -63,7 +71,8 @@ psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-E
         view_count INTEGER DEFAULT 0,
         created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
         updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-        published_at TIMESTAMP WITH TIME ZONE
+        published_at TIMESTAMP WITH TIME ZONE,
+        search_vector TSVECTOR
     );
     
     CREATE TABLE IF NOT EXISTS posts.tags (
@@ -79,6 +88,14 @@ psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-E
         PRIMARY KEY (post_id, tag_id)
     );
     
+    CREATE TABLE IF NOT EXISTS posts.post_events (
+        id BIGSERIAL PRIMARY KEY,
+        post_id UUID NOT NULL,
+        slug VARCHAR(255) NOT NULL,
+        event_type VARCHAR(50) NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    );
+    
     -- Comment Service Tables
     CREATE TABLE IF NOT EXISTS comments.comments (
         id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -89,12 +106,30 @@ psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-E
         is_deleted BOOLEAN DEFAULT false,
         created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
         updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-        edited_at TIMESTAMP WITH TIME ZONE
+        edited_at TIMESTAMP WITH TIME ZONE,
+        path TEXT COLLATE "C",
+        depth INTEGER
+    );
+    
+    CREATE TABLE IF NOT EXISTS comments.post_comment_stats (
+        post_id UUID PRIMARY KEY,
+        comment_count INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    
+    CREATE TABLE IF NOT EXISTS comments.outbox_offsets (
+        consumer VARCHAR(100) PRIMARY KEY,
+        last_event_id BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
     );
     
     CREATE INDEX IF NOT EXISTS idx_comments_post_id ON comments.comments(post_id);
     CREATE INDEX IF NOT EXISTS idx_comments_author_id ON comments.comments(author_id);
     CREATE INDEX IF NOT EXISTS idx_comments_parent_id ON comments.comments(parent_id);
+    CREATE INDEX IF NOT EXISTS idx_comments_post_roots_created_at ON comments.comments(post_id, created_at DESC) WHERE parent_id IS NULL AND is_deleted = false;
+    CREATE INDEX IF NOT EXISTS idx_comments_post_live_created_at ON comments.comments(post_id, created_at) WHERE is_deleted = false;
+    CREATE INDEX IF NOT EXISTS idx_comments_parent_live_created_at ON comments.comments(parent_id, created_at) WHERE is_deleted = false;
+    CREATE INDEX IF NOT EXISTS idx_comments_post_live_path ON comments.comments(post_id, path) WHERE is_deleted = false;
     
     -- Like Service Tables
     CREATE TABLE IF NOT EXISTS likes.likes (
@@ -105,17 +140,29 @@ psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-E
         UNIQUE(post_id, user_id)
     );
     
-    CREATE INDEX IF NOT EXISTS idx_likes_post_id ON likes.likes(post_id);
-    CREATE INDEX IF NOT EXISTS idx_likes_user_id ON likes.likes(user_id);
+    CREATE INDEX IF NOT EXISTS idx_likes_post_created_at ON likes.likes(post_id, created_at, id);
+    CREATE INDEX IF NOT EXISTS idx_likes_user_created_at ON likes.likes(user_id, created_at DESC, id DESC);
+    
+    CREATE TABLE IF NOT EXISTS likes.post_like_counts (
+        post_id UUID NOT NULL,
+        shard SMALLINT NOT NULL DEFAULT 0,
+        like_count INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (post_id, shard)
+    );
     
     -- Create indexes for better performance
     CREATE INDEX IF NOT EXISTS idx_users_email ON auth.users(email);
-    CREATE INDEX IF NOT EXISTS idx_refresh_tokens_token ON auth.refresh_tokens(token);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_refresh_tokens_token_hash ON auth.refresh_tokens(token_hash);
+    CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires_at ON auth.refresh_tokens(expires_at);
     CREATE INDEX IF NOT EXISTS idx_profiles_username ON users.profiles(username);
     CREATE INDEX IF NOT EXISTS idx_posts_author_id ON posts.posts(author_id);
     CREATE INDEX IF NOT EXISTS idx_posts_slug ON posts.posts(slug);
     CREATE INDEX IF NOT EXISTS idx_posts_status ON posts.posts(status);
     CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts.posts(created_at);
+    CREATE INDEX IF NOT EXISTS idx_posts_status_created_at_id ON posts.posts(status, created_at DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_posts_author_status_created_at_id ON posts.posts(author_id, status, created_at DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_posts_search_vector ON posts.posts USING GIN (search_vector);
     
     -- Insert some sample tags
     INSERT INTO posts.tags (name, slug) VALUES 
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Concurrent throughput check for a single service worker.
+
+Fires a fixed number of GET requests at one endpoint with N requests in flight
+and reports requests/second and latency percentiles. Run it against a service
+started with a single uvicorn worker, once on the old build and once on the new
+one, to compare throughput per worker.
+
+Usage:
+    python scripts/loadtest_concurrency.py http://localhost:8003/posts \
+        --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def worker(client, url, headers, queue, latencies, errors):
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        try:
+            response = await client.get(url, headers=headers)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(url, total, concurrency, token):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        # Warm up connections and any server-side caches
+        await client.get(url, headers=headers)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                worker(client, url, headers, queue, latencies, errors)
+                for _ in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"URL:          {url}")
+    print(f"Requests:     {total} ({len(errors)} errors)")
+    print(f"Concurrency:  {concurrency}")
+    print(f"Elapsed:      {elapsed:.2f}s")
+    print(f"Throughput:   {total / elapsed:.1f} req/s")
+    print(f"Latency p50:  {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"Latency p95:  {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+    print(f"Latency p99:  {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("url", help="Endpoint to request")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--token", help="Bearer token for authenticated endpoints")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.requests, args.concurrency, args.token))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+-- Migration: Add partial indexes matching the comment service's read paths
+-- Run this against the blogin database
+--
+-- Every CommentService read skips deleted comments, so the indexes below only
+-- cover live rows. Check them with scripts/check_comment_query_plans.py.
+
+-- Top-level comments of a post, newest first (GET /comments/post/{post_id})
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_comments_post_roots_created_at
+    ON comments.comments(post_id, created_at DESC)
+    WHERE parent_id IS NULL AND is_deleted = false;
+
+-- Every comment of a post in creation order (GET /comments/post/{post_id}/all)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_comments_post_live_created_at
+    ON comments.comments(post_id, created_at)
+    WHERE is_deleted = false;
+
+-- Direct replies of a comment in creation order (threaded view)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_comments_parent_live_created_at
+    ON comments.comments(parent_id, created_at)
+    WHERE is_deleted = false;
+
+-- Subtree and thread-order scans on the materialized path
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_comments_post_live_path
+    ON comments.comments(post_id, path)
+    WHERE is_deleted = false;
+
+-- Superseded by idx_comments_post_live_path
+DROP INDEX CONCURRENTLY IF EXISTS comments.idx_comments_post_path;
+
+-- Verify the migration
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE schemaname = 'comments' AND tablename = 'comments';
@@ -0,0 +1,45 @@
+-- Migration: Add materialized path and depth to comments
+-- Run this against the blogin database
+--
+-- path is the dot-separated list of segments from the root comment down to the
+-- comment itself. Each segment is the creation time in microseconds since the
+-- epoch (14 hex digits) followed by the comment id without dashes, matching
+-- path_segment() in comment-service, so ordering by path gives thread order.
+
+-- Add new columns to the comments.comments table
+ALTER TABLE comments.comments ADD COLUMN IF NOT EXISTS path TEXT COLLATE "C";
+ALTER TABLE comments.comments ADD COLUMN IF NOT EXISTS depth INTEGER;
+
+-- Backfill existing comments, walking down from the top-level comments
+WITH RECURSIVE tree AS (
+    SELECT
+        c.id,
+        lpad(to_hex(round(extract(epoch FROM c.created_at) * 1000000)::bigint), 14, '0')
+            || replace(c.id::text, '-', '') AS path,
+        0 AS depth
+    FROM comments.comments c
+    WHERE c.parent_id IS NULL
+    UNION ALL
+    SELECT
+        c.id,
+        t.path || '.' || lpad(to_hex(round(extract(epoch FROM c.created_at) * 1000000)::bigint), 14, '0')
+            || replace(c.id::text, '-', ''),
+        t.depth + 1
+    FROM comments.comments c
+    JOIN tree t ON c.parent_id = t.id
+)
+UPDATE comments.comments c
+SET path = t.path, depth = t.depth
+FROM tree t
+WHERE c.id = t.id
+  AND c.path IS NULL;
+
+-- Subtree and thread-order queries are range scans on (post_id, path)
+CREATE INDEX IF NOT EXISTS idx_comments_post_path ON comments.comments(post_id, path);
+
+-- Verify the migration
+SELECT
+    COUNT(*) AS total,
+    COUNT(path) AS with_path,
+    MAX(depth) AS max_depth
+FROM comments.comments;
@@ -0,0 +1,24 @@
+-- Migration: Add per-post comment counters
+-- Run this against the blogin database
+
+-- One row per post with its number of non-deleted comments
+CREATE TABLE IF NOT EXISTS comments.post_comment_stats (
+    post_id UUID PRIMARY KEY,
+    comment_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Backfill counters from existing comments
+INSERT INTO comments.post_comment_stats (post_id, comment_count, updated_at)
+SELECT post_id, COUNT(*) FILTER (WHERE NOT is_deleted), CURRENT_TIMESTAMP
+FROM comments.comments
+GROUP BY post_id
+ON CONFLICT (post_id) DO UPDATE
+SET comment_count = EXCLUDED.comment_count,
+    updated_at = EXCLUDED.updated_at;
+
+-- Verify the migration
+SELECT post_id, comment_count
+FROM comments.post_comment_stats
+ORDER BY comment_count DESC
+LIMIT 10;
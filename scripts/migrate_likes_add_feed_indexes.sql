@@ -0,0 +1,19 @@
+-- Migration: Add ordered indexes for the like service's list endpoints
+-- Run this against the blogin database
+
+-- Posts a user liked, newest first (GET /likes/me)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_likes_user_created_at
+    ON likes.likes(user_id, created_at DESC, id DESC);
+
+-- A post's likers in like order (GET /likes/post/{post_slug}/likers/export)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_likes_post_created_at
+    ON likes.likes(post_id, created_at, id);
+
+-- Superseded by the two indexes above
+DROP INDEX CONCURRENTLY IF EXISTS likes.idx_likes_user_id;
+DROP INDEX CONCURRENTLY IF EXISTS likes.idx_likes_post_id;
+
+-- Verify the migration
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE schemaname = 'likes' AND tablename = 'likes';
@@ -0,0 +1,28 @@
+-- Migration: Add per-post like counters
+-- Run this against the blogin database
+
+-- One or more counter shards per post; a post's like count is the sum of
+-- its shards (see LIKE_COUNTER_SHARDS)
+CREATE TABLE IF NOT EXISTS likes.post_like_counts (
+    post_id UUID NOT NULL,
+    shard SMALLINT NOT NULL DEFAULT 0,
+    like_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (post_id, shard)
+);
+
+-- Backfill counters from existing likes into shard 0
+INSERT INTO likes.post_like_counts (post_id, shard, like_count, updated_at)
+SELECT post_id, 0, COUNT(*), CURRENT_TIMESTAMP
+FROM likes.likes
+GROUP BY post_id
+ON CONFLICT (post_id, shard) DO UPDATE
+SET like_count = EXCLUDED.like_count,
+    updated_at = EXCLUDED.updated_at;
+
+-- Verify the migration
+SELECT post_id, SUM(like_count) AS like_count
+FROM likes.post_like_counts
+GROUP BY post_id
+ORDER BY like_count DESC
+LIMIT 10;
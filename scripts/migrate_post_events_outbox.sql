@@ -0,0 +1,16 @@
+-- Migration: Add the post slug change outbox
+-- Run this against the blogin database
+
+-- post-service records a row here whenever a slug starts or stops resolving
+-- (post created, renamed or deleted), in the same transaction as the change.
+-- like-service polls it to evict its cached slug -> post id lookups.
+CREATE TABLE IF NOT EXISTS posts.post_events (
+    id BIGSERIAL PRIMARY KEY,
+    post_id UUID NOT NULL,
+    slug VARCHAR(255) NOT NULL,
+    event_type VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Verify the migration
+SELECT COUNT(*) AS events FROM posts.post_events;
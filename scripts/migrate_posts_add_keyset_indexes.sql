@@ -0,0 +1,15 @@
+-- Migration: Add composite indexes for keyset (cursor) pagination of posts
+-- Run this against the blogin database
+
+-- Feed listing: WHERE status = ? ORDER BY created_at DESC, id DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_posts_status_created_at_id
+    ON posts.posts(status, created_at DESC, id DESC);
+
+-- Author listing: WHERE author_id = ? AND status = ? ORDER BY created_at DESC, id DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_posts_author_status_created_at_id
+    ON posts.posts(author_id, status, created_at DESC, id DESC);
+
+-- Verify the migration
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE schemaname = 'posts' AND tablename = 'posts';
@@ -0,0 +1,24 @@
+-- Migration: Add full-text search vector to posts
+-- Run this against the blogin database
+
+-- Weighted document vector: title (A) > summary (B) > content (C)
+ALTER TABLE posts.posts ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+
+-- Backfill existing posts
+UPDATE posts.posts
+SET search_vector =
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(content, '')), 'C')
+WHERE search_vector IS NULL;
+
+-- GIN index for @@ matching
+CREATE INDEX IF NOT EXISTS idx_posts_search_vector ON posts.posts USING GIN (search_vector);
+
+-- Verify the migration
+SELECT
+    id,
+    title,
+    search_vector IS NOT NULL as has_search_vector
+FROM posts.posts
+LIMIT 10;
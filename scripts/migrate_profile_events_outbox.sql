@@ -0,0 +1,23 @@
+-- Migration: Add the profile change outbox and consumer offsets
+-- Run this against the blogin database
+
+-- user-service records a row here whenever a username, display name or avatar
+-- changes, in the same transaction as the change
+CREATE TABLE IF NOT EXISTS users.profile_events (
+    id BIGSERIAL PRIMARY KEY,
+    user_id UUID NOT NULL,
+    event_type VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- comment-service remembers the last event it applied to comment author fields
+CREATE TABLE IF NOT EXISTS comments.outbox_offsets (
+    consumer VARCHAR(100) PRIMARY KEY,
+    last_event_id BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Verify the migration
+SELECT
+    (SELECT COUNT(*) FROM users.profile_events) AS pending_events,
+    (SELECT COUNT(*) FROM comments.outbox_offsets) AS consumers;
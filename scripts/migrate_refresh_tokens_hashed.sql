@@ -0,0 +1,36 @@
+-- Migration: Store refresh tokens as SHA-256 digests and drop the raw token column
+-- Run this against the blogin database
+-- Deploy together with the auth service version that writes token_hash
+
+BEGIN;
+
+ALTER TABLE auth.refresh_tokens ADD COLUMN IF NOT EXISTS token_hash BYTEA;
+ALTER TABLE auth.refresh_tokens ADD COLUMN IF NOT EXISTS rotated_at TIMESTAMP WITH TIME ZONE;
+
+-- Expired and revoked tokens can never be used again
+DELETE FROM auth.refresh_tokens
+WHERE expires_at < CURRENT_TIMESTAMP OR revoked_at IS NOT NULL;
+
+-- Live tokens stay valid: they are found by digest, and each row becomes
+-- the session its token rotates within
+UPDATE auth.refresh_tokens
+SET token_hash = sha256(convert_to(token, 'UTF8'))
+WHERE token_hash IS NULL;
+
+ALTER TABLE auth.refresh_tokens ALTER COLUMN token_hash SET NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_refresh_tokens_token_hash
+    ON auth.refresh_tokens(token_hash);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires_at
+    ON auth.refresh_tokens(expires_at);
+
+-- Also drops the unique constraint on token
+DROP INDEX IF EXISTS auth.idx_refresh_tokens_token;
+ALTER TABLE auth.refresh_tokens DROP COLUMN IF EXISTS token;
+
+COMMIT;
+
+-- Verify the migration
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE schemaname = 'auth' AND tablename = 'refresh_tokens';
@@ -1,13 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.routers import auth
-from app.database import Base, engine
+from app.database import Base, engine, pool_metrics
+from app.services.password_hasher import HasherBusy, password_hasher
+from app.services.signing_keys import signing_keys
+from app.services.token_pruner import run_token_pruner
+from app.config import get_settings
+import asyncio
 import logging
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 app = FastAPI(
     title="Blogin Auth Service",
@@ -30,15 +37,35 @@ app.add_middleware(
 async def startup_event():
     logger.info("Starting up Auth Service...")
     try:
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created/verified")
     except Exception as e:
         logger.error(f"Error creating tables: {e}")
 
+    app.state.token_pruner = asyncio.create_task(
+        run_token_pruner(
+            settings.REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS,
+            settings.REFRESH_TOKEN_PRUNE_BATCH_SIZE,
+        )
+    )
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Auth Service...")
+    app.state.token_pruner.cancel()
+    password_hasher.shutdown()
+    await engine.dispose()
+
+
+@app.exception_handler(HasherBusy)
+async def hasher_busy_handler(request: Request, exc: HasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is temporarily overloaded, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/health")
@@ -46,6 +73,29 @@ async def health_check():
     return {"status": "healthy", "service": "auth-service"}
 
 
+@app.get("/metrics/pool")
+async def get_pool_metrics():
+    return {"service": "auth-service", **pool_metrics()}
+
+
+@app.get("/metrics/hashing")
+async def get_hashing_metrics():
+    return {"service": "auth-service", **password_hasher.metrics()}
+
+
+# Built once at import; keys only change with a redeploy
+JWKS = signing_keys.jwks()
+
+
+@app.get("/.well-known/jwks.json")
+async def get_jwks():
+    """Public keys other services verify access tokens with."""
+    return JSONResponse(
+        JWKS,
+        headers={"Cache-Control": f"public, max-age={settings.JWKS_MAX_AGE_SECONDS}"},
+    )
+
+
 app.include_router(auth.router)
 
 if __name__ == "__main__":
@@ -1,4 +1,12 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    String,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.database import Base
@@ -21,16 +29,31 @@ class User(Base):
 
 
 class RefreshToken(Base):
+    """
+    One row per login session. Rotating the refresh token replaces its hash
+    in place, so a session keeps a single row however often it refreshes.
+    """
+
     __tablename__ = "refresh_tokens"
     __table_args__ = {"schema": "auth"}
 
+    # Carried in the token as its "sid" claim
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(
         UUID(as_uuid=True),
         ForeignKey("auth.users.id", ondelete="CASCADE"),
         nullable=False,
     )
-    token = Column(String(255), unique=True, nullable=False)
+    # SHA-256 of the session's current refresh token
+    token_hash = Column(LargeBinary, nullable=False)
+    # Pulled forward to the revocation time on revoke, so pruning only checks this
     expires_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    rotated_at = Column(DateTime(timezone=True), nullable=True)
     revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+
+# Refresh and logout find the session by the presented token's hash
+Index("idx_refresh_tokens_token_hash", RefreshToken.token_hash, unique=True)
+# The pruner deletes in expiry order
+Index("idx_refresh_tokens_expires_at", RefreshToken.expires_at)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime, timedelta
 import uuid
@@ -22,12 +22,13 @@ from app.services.auth_service import (
     create_refresh_token,
     create_refresh_token_record,
     revoke_refresh_token,
-    verify_refresh_token,
+    rotate_refresh_token,
     get_user_by_id,
-    get_password_hash,
-    verify_password,
+    hash_password,
+    check_password,
     get_user_by_email,
     decode_token,
+    decode_refresh_token,
 )
 from app.config import get_settings
 
@@ -38,16 +39,16 @@ settings = get_settings()
 
 
 @router.post("/register", response_model=APIResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check if user exists
-    existing_user = get_user_by_email(db, user_data.email)
+    existing_user = await get_user_by_email(db, user_data.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     new_user = User(
         id=uuid.uuid4(),
         email=user_data.email,
@@ -57,8 +58,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return APIResponse(
         success=True,
@@ -69,8 +70,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=APIResponse)
-async def login(login_data: UserLogin, db: Session = Depends(get_db)):
-    user = authenticate_user(db, login_data.email, login_data.password)
+async def login(login_data: UserLogin, db: AsyncSession = Depends(get_db)):
+    user = await authenticate_user(db, login_data.email, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -83,8 +84,11 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
         data={"sub": str(user.id)}, expires_delta=access_token_expires
     )
 
-    refresh_token, token_id, expires_at = create_refresh_token(str(user.id))
-    create_refresh_token_record(db, user.id, refresh_token, expires_at)
+    session_id = uuid.uuid4()
+    refresh_token, token_id, expires_at = create_refresh_token(str(user.id), session_id)
+    await create_refresh_token_record(
+        db, session_id, user.id, refresh_token, expires_at
+    )
 
     return APIResponse(
         success=True,
@@ -106,31 +110,32 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
 
 @router.post("/refresh", response_model=APIResponse)
 async def refresh_token(
-    refresh_data: RefreshTokenRequest, db: Session = Depends(get_db)
+    refresh_data: RefreshTokenRequest, db: AsyncSession = Depends(get_db)
 ):
-    # Verify refresh token in database
-    token_record = verify_refresh_token(db, refresh_data.refresh_token)
-    if not token_record:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired refresh token",
-        )
-
-    # Decode and verify JWT
-    payload = decode_token(refresh_data.refresh_token)
+    # Decode and verify JWT before touching the database
+    payload = decode_refresh_token(refresh_data.refresh_token)
     if not payload or payload.get("type") != "refresh":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type"
         )
 
     user_id = payload.get("sub")
-    user = get_user_by_id(db, uuid.UUID(user_id))
+    user = await get_user_by_id(db, uuid.UUID(user_id))
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
 
+    # Swap the refresh token for a new one; the presented token stops working
+    rotated = await rotate_refresh_token(db, refresh_data.refresh_token, payload)
+    if not rotated:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+        )
+    new_refresh_token, _ = rotated
+
     # Create new access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -141,6 +146,7 @@ async def refresh_token(
         success=True,
         data={
             "access_token": access_token,
+            "refresh_token": new_refresh_token,
             "token_type": "bearer",
             "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
         },
@@ -153,10 +159,10 @@ async def refresh_token(
 async def logout(
     refresh_data: RefreshTokenRequest,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     # Revoke refresh token
-    revoked = revoke_refresh_token(db, refresh_data.refresh_token)
+    revoked = await revoke_refresh_token(db, refresh_data.refresh_token)
 
     return APIResponse(
         success=True,
@@ -191,7 +197,7 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
 @router.get("/me", response_model=APIResponse)
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     token = credentials.credentials
     payload = decode_token(token)
@@ -202,7 +208,7 @@ async def get_current_user(
         )
 
     user_id = payload.get("sub")
-    user = get_user_by_id(db, uuid.UUID(user_id))
+    user = await get_user_by_id(db, uuid.UUID(user_id))
 
     if not user:
         raise HTTPException(
@@ -227,7 +233,7 @@ async def get_current_user(
 async def change_password(
     password_data: PasswordChange,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     token = credentials.credentials
     payload = decode_token(token)
@@ -238,7 +244,7 @@ async def change_password(
         )
 
     user_id = payload.get("sub")
-    user = get_user_by_id(db, uuid.UUID(user_id))
+    user = await get_user_by_id(db, uuid.UUID(user_id))
 
     if not user:
         raise HTTPException(
@@ -246,15 +252,15 @@ async def change_password(
         )
 
     # Verify current password
-    if not verify_password(password_data.current_password, user.password_hash):
+    if not await check_password(password_data.current_password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect",
         )
 
     # Update password
-    user.password_hash = get_password_hash(password_data.new_password)
-    db.commit()
+    user.password_hash = await hash_password(password_data.new_password)
+    await db.commit()
 
     return APIResponse(
         success=True, data=None, message="Password changed successfully", errors=None
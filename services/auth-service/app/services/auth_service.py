@@ -1,14 +1,28 @@
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 from jose import JWTError, jwt
 import bcrypt
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import SessionLocal
 from app.models import User, RefreshToken
+from app.services.password_hasher import HasherBusy, password_hasher
+from app.services.signing_keys import signing_keys
 from app.config import get_settings
+import asyncio
+import hashlib
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Refresh tokens never leave auth-service, so they stay on the shared secret
+# even when access tokens are signed with an asymmetric key
+REFRESH_TOKEN_ALGORITHM = (
+    settings.JWT_ALGORITHM if settings.JWT_ALGORITHM.startswith("HS") else "HS256"
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash using bcrypt directly."""
@@ -20,11 +34,32 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     """Hash a password using bcrypt directly with salt."""
     password_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt(rounds=12)
+    salt = bcrypt.gensalt(rounds=settings.PASSWORD_HASH_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode("utf-8")
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a different bcrypt cost than configured."""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return False
+    return rounds != settings.PASSWORD_HASH_ROUNDS
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password on the bcrypt worker pool."""
+    return await password_hasher.run("hash", get_password_hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt worker pool."""
+    return await password_hasher.run(
+        "verify", verify_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -35,82 +70,246 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         )
 
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
-    )
-    return encoded_jwt
+    return signing_keys.sign(to_encode)
 
 
-def create_refresh_token(user_id: str) -> str:
+def create_refresh_token(
+    user_id: str, session_id: uuid.UUID
+) -> Tuple[str, str, datetime]:
     token_id = str(uuid.uuid4())
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
-    data = {"sub": user_id, "jti": token_id, "exp": expire, "type": "refresh"}
+    data = {
+        "sub": user_id,
+        "sid": str(session_id),
+        "jti": token_id,
+        "exp": expire,
+        "type": "refresh",
+    }
 
-    token = jwt.encode(data, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    token = jwt.encode(data, settings.JWT_SECRET_KEY, algorithm=REFRESH_TOKEN_ALGORITHM)
     return token, token_id, expire
 
 
 def decode_token(token: str) -> Optional[dict]:
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+        return signing_keys.verify(token)
+    except JWTError:
+        return None
+
+
+def decode_refresh_token(token: str) -> Optional[dict]:
+    try:
+        return jwt.decode(
+            token, settings.JWT_SECRET_KEY, algorithms=[REFRESH_TOKEN_ALGORITHM]
         )
-        return payload
     except JWTError:
         return None
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = db.query(User).filter(User.email == email, User.is_active == True).first()
+async def authenticate_user(
+    db: AsyncSession, email: str, password: str
+) -> Optional[User]:
+    user = await db.scalar(
+        select(User).where(User.email == email, User.is_active == True)
+    )
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    if not await check_password(password, user.password_hash):
         return None
+    if needs_rehash(user.password_hash):
+        schedule_rehash(user.id, password, user.password_hash)
     return user
 
 
-def create_refresh_token_record(
-    db: Session, user_id: uuid.UUID, token: str, expires_at: datetime
+# Strong references so pending rehash tasks are not garbage collected
+_rehash_tasks = set()
+
+
+def schedule_rehash(user_id: uuid.UUID, password: str, old_hash: str):
+    task = asyncio.create_task(rehash_password(user_id, password, old_hash))
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+
+
+async def rehash_password(user_id: uuid.UUID, password: str, old_hash: str):
+    """Re-hash a password at the configured cost after a successful login."""
+    try:
+        new_hash = await hash_password(password)
+    except HasherBusy:
+        # Not worth competing with logins; the next login will try again
+        return
+
+    try:
+        async with SessionLocal() as db:
+            # Only replace the hash we verified, in case the password changed
+            await db.execute(
+                update(User)
+                .where(User.id == user_id, User.password_hash == old_hash)
+                .values(password_hash=new_hash)
+            )
+            await db.commit()
+    except Exception as e:
+        logger.error(f"Error rehashing password for user {user_id}: {e}")
+
+
+def hash_refresh_token(token: str) -> bytes:
+    """Fixed-length digest a refresh token is stored and looked up by."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+async def create_refresh_token_record(
+    db: AsyncSession,
+    session_id: uuid.UUID,
+    user_id: uuid.UUID,
+    token: str,
+    expires_at: datetime,
 ) -> RefreshToken:
-    refresh_token = RefreshToken(user_id=user_id, token=token, expires_at=expires_at)
+    refresh_token = RefreshToken(
+        id=session_id,
+        user_id=user_id,
+        token_hash=hash_refresh_token(token),
+        expires_at=expires_at,
+    )
     db.add(refresh_token)
-    db.commit()
-    db.refresh(refresh_token)
+    await db.commit()
     return refresh_token
 
 
-def revoke_refresh_token(db: Session, token: str) -> bool:
-    refresh_token = (
-        db.query(RefreshToken)
-        .filter(RefreshToken.token == token, RefreshToken.revoked_at.is_(None))
-        .first()
+async def rotate_refresh_token(
+    db: AsyncSession, token: str, payload: dict
+) -> Optional[Tuple[str, datetime]]:
+    """
+    Replace a session's current refresh token with a new one.
+
+    Returns the new token and its expiry, or None if ``token`` isn't the
+    session's current token. Presenting an earlier token of a live session
+    means it was copied, so the whole session is revoked, unless the session
+    rotated within REFRESH_TOKEN_REUSE_GRACE_SECONDS: that is a concurrent
+    refresh losing the race (say two tabs sharing storage), which is only
+    turned away.
+    """
+    token_hash = hash_refresh_token(token)
+    session_id = payload.get("sid")
+    if session_id is None:
+        # Issued before tokens carried their session; the row id is the session
+        session_id = await db.scalar(
+            select(RefreshToken.id).where(RefreshToken.token_hash == token_hash)
+        )
+        if session_id is None:
+            return None
+    session_id = uuid.UUID(str(session_id))
+
+    new_token, _, expires_at = create_refresh_token(payload["sub"], session_id)
+    # Matching on the old hash makes concurrent refreshes with one token
+    # race for a single winner
+    rotated = await db.scalar(
+        update(RefreshToken)
+        .where(
+            RefreshToken.id == session_id,
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > func.now(),
+        )
+        .values(
+            token_hash=hash_refresh_token(new_token),
+            expires_at=expires_at,
+            rotated_at=func.now(),
+        )
+        .returning(RefreshToken.id)
+    )
+    if rotated is None:
+        grace = timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+        if await revoke_session(db, session_id, rotated_before=func.now() - grace):
+            logger.warning(
+                f"Refresh token reuse detected, revoked session {session_id}"
+            )
+        return None
+
+    await db.commit()
+    return new_token, expires_at
+
+
+async def revoke_session(
+    db: AsyncSession, session_id: uuid.UUID, rotated_before=None
+) -> bool:
+    """
+    Revoke a live session. With ``rotated_before``, only if its token was
+    last rotated before then; checked in the UPDATE so a rotation landing
+    meanwhile is seen.
+    """
+    conditions = [
+        RefreshToken.id == session_id,
+        RefreshToken.revoked_at.is_(None),
+        RefreshToken.expires_at > func.now(),
+    ]
+    if rotated_before is not None:
+        conditions.append(
+            or_(
+                RefreshToken.rotated_at.is_(None),
+                RefreshToken.rotated_at < rotated_before,
+            )
+        )
+    revoked = await db.scalar(
+        update(RefreshToken)
+        .where(*conditions)
+        .values(revoked_at=func.now(), expires_at=func.now())
+        .returning(RefreshToken.id)
     )
+    await db.commit()
+    return revoked is not None
 
-    if refresh_token:
-        refresh_token.revoked_at = datetime.utcnow()
-        db.commit()
-        return True
-    return False
 
+async def revoke_refresh_token(db: AsyncSession, token: str) -> bool:
+    """Revoke the session ``token`` belongs to, even if it was since rotated."""
+    payload = decode_refresh_token(token)
+    if payload and payload.get("sid"):
+        return await revoke_session(db, uuid.UUID(payload["sid"]))
 
-def verify_refresh_token(db: Session, token: str) -> Optional[RefreshToken]:
-    refresh_token = (
-        db.query(RefreshToken)
-        .filter(
-            RefreshToken.token == token,
+    revoked = await db.scalar(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == hash_refresh_token(token),
             RefreshToken.revoked_at.is_(None),
-            RefreshToken.expires_at > datetime.utcnow(),
         )
-        .first()
+        .values(revoked_at=func.now(), expires_at=func.now())
+        .returning(RefreshToken.id)
     )
+    await db.commit()
+    return revoked is not None
 
-    return refresh_token
 
+async def prune_refresh_tokens(batch_size: int) -> int:
+    """
+    Delete expired and revoked refresh tokens, ``batch_size`` rows per
+    transaction so the deletes never hold many locks at once.
+    """
+    pruned = 0
+    while True:
+        async with SessionLocal() as db:
+            expired = (
+                select(RefreshToken.id)
+                .where(RefreshToken.expires_at < func.now())
+                .order_by(RefreshToken.expires_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(
+                delete(RefreshToken).where(
+                    RefreshToken.id.in_(expired.scalar_subquery())
+                )
+            )
+            await db.commit()
+        pruned += result.rowcount
+        if result.rowcount < batch_size:
+            return pruned
 
-def get_user_by_id(db: Session, user_id: uuid.UUID) -> Optional[User]:
-    return db.query(User).filter(User.id == user_id, User.is_active == True).first()
+
+async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+    return await db.scalar(
+        select(User).where(User.id == user_id, User.is_active == True)
+    )
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    return await db.scalar(select(User).where(User.email == email))
@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+import asyncio
+import time
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue is full and the request should be shed."""
+
+
+class OperationStats:
+    """Latency totals for one kind of bcrypt operation."""
+
+    def __init__(self):
+        self.count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+    def record(self, waited: float, ran: float):
+        self.count += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        self.run_total += ran
+        self.run_max = max(self.run_max, ran)
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "queue_wait_seconds_avg": (
+                round(self.wait_total / self.count, 6) if self.count else 0.0
+            ),
+            "queue_wait_seconds_max": round(self.wait_max, 6),
+            "latency_seconds_avg": (
+                round(self.run_total / self.count, 6) if self.count else 0.0
+            ),
+            "latency_seconds_max": round(self.run_max, 6),
+        }
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a fixed-size thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism.
+    At most ``workers + max_queue`` operations are accepted at once; beyond
+    that ``HasherBusy`` is raised so the caller can answer 503 rather than
+    letting logins queue up behind each other indefinitely.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_pending = workers + max_queue
+        self.pending = 0
+        self.rejected = 0
+        self.stats = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+
+    async def run(self, operation: str, func: Callable, *args):
+        # Only touched from the event loop thread, so no lock is needed
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HasherBusy()
+
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started - submitted, time.perf_counter() - started
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, waited, ran = await loop.run_in_executor(self._executor, timed)
+        finally:
+            self.pending -= 1
+
+        self.stats.setdefault(operation, OperationStats()).record(waited, ran)
+        return result
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected_total": self.rejected,
+            **{name: stats.snapshot() for name, stats in self.stats.items()},
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE
+)
@@ -0,0 +1,91 @@
+import base64
+import hashlib
+import json
+from typing import Optional
+from jose import JWTError, jwk, jwt
+from app.config import get_settings
+
+settings = get_settings()
+
+PEM_END = "-----END PUBLIC KEY-----"
+
+
+def key_id(public_jwk: dict) -> str:
+    """RFC 7638 thumbprint of an EC public key, used as its ``kid``."""
+    members = {name: public_jwk[name] for name in ("crv", "kty", "x", "y")}
+    digest = hashlib.sha256(
+        json.dumps(members, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def split_pems(pems: str) -> list:
+    """Split concatenated public key PEM blocks."""
+    return [block + PEM_END for block in pems.split(PEM_END) if block.strip()]
+
+
+class SigningKeys:
+    """
+    The key tokens are signed with and the keys they are verified against.
+
+    With an HS* algorithm this is just the shared secret. With ES256 tokens
+    are signed with JWT_PRIVATE_KEY and carry its ``kid``. Its public key,
+    plus any JWT_ADDITIONAL_PUBLIC_KEYS (the next key before a rotation, or
+    the previous one until its tokens expire), is published as the JWKS that
+    other services verify against.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret: str,
+        private_pem: str = "",
+        additional_public_pems: str = "",
+    ):
+        self.algorithm = algorithm
+        self.kid: Optional[str] = None
+        self.public_keys = {}
+        if algorithm.startswith("HS"):
+            self.signing_key = secret
+            return
+
+        if not private_pem:
+            raise ValueError(f"JWT_PRIVATE_KEY must be set to sign with {algorithm}")
+        self.signing_key = jwk.construct(private_pem, algorithm)
+        public_keys = [self.signing_key.public_key()] + [
+            jwk.construct(pem, algorithm) for pem in split_pems(additional_public_pems)
+        ]
+        for public_key in public_keys:
+            self.public_keys[key_id(public_key.to_dict())] = public_key
+        self.kid = key_id(self.signing_key.public_key().to_dict())
+
+    def sign(self, claims: dict) -> str:
+        headers = {"kid": self.kid} if self.kid else None
+        return jwt.encode(
+            claims, self.signing_key, algorithm=self.algorithm, headers=headers
+        )
+
+    def verify(self, token: str) -> dict:
+        """Verified claims of ``token``. Raises JWTError if it doesn't verify."""
+        key = self.signing_key
+        if self.kid:
+            key = self.public_keys.get(jwt.get_unverified_header(token).get("kid"))
+            if key is None:
+                raise JWTError("Unknown signing key")
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+
+    def jwks(self) -> dict:
+        return {
+            "keys": [
+                {**public_key.to_dict(), "kid": kid, "use": "sig"}
+                for kid, public_key in self.public_keys.items()
+            ]
+        }
+
+
+signing_keys = SigningKeys(
+    settings.JWT_ALGORITHM,
+    settings.JWT_SECRET_KEY,
+    settings.JWT_PRIVATE_KEY,
+    settings.JWT_ADDITIONAL_PUBLIC_KEYS,
+)
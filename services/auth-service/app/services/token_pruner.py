@@ -0,0 +1,17 @@
+import asyncio
+import logging
+from app.services.auth_service import prune_refresh_tokens
+
+logger = logging.getLogger(__name__)
+
+
+async def run_token_pruner(interval: float, batch_size: int):
+    """Periodically delete expired and revoked refresh tokens."""
+    while True:
+        try:
+            pruned = await prune_refresh_tokens(batch_size)
+            if pruned:
+                logger.info(f"Pruned {pruned} refresh tokens")
+        except Exception as e:
+            logger.error(f"Error pruning refresh tokens: {e}")
+        await asyncio.sleep(interval)
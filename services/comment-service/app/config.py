@@ -11,9 +11,50 @@ class Settings(BaseSettings):
 
     JWT_SECRET_KEY: str = "your-secret-key-here"
     JWT_ALGORITHM: str = "HS256"
+    # Verified access tokens kept in memory until they expire
+    JWT_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_SERVICE_URL: str = "http://auth-service:8000"
+    # With JWT_ALGORITHM=ES256, public keys come from auth-service's JWKS
+    JWKS_REFRESH_INTERVAL_SECONDS: float = 300.0
+    # Floor between refreshes triggered by tokens with an unknown kid
+    JWKS_MIN_REFRESH_SECONDS: float = 30.0
 
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
+    # Direct replies shown under each top-level comment in the threaded view
+    THREAD_REPLY_PREVIEW: int = 3
+    # Each level adds 47 characters to the indexed path; keep it under the
+    # btree row limit (~2700 bytes)
+    MAX_COMMENT_DEPTH: int = 32
+
+    COUNT_EXACT_THRESHOLD: int = 1000
+    COUNT_CACHE_TTL_SECONDS: int = 60
+    # How often post_comment_stats is checked against comments.comments
+    COMMENT_STATS_RECONCILE_INTERVAL_SECONDS: float = 900.0
+    MAX_BATCH_POST_IDS: int = 100
+
+    # Bulk NDJSON import: rows per request and rows written per transaction
+    MAX_BULK_COMMENTS: int = 50000
+    # Longest NDJSON line read; a few times the 5000-character content limit
+    MAX_BULK_LINE_BYTES: int = 65536
+    BULK_COMMENT_CHUNK_SIZE: int = 1000
+
+    # Polling of the users.profile_events outbox for author name/avatar changes
+    AUTHOR_SYNC_INTERVAL_SECONDS: float = 10.0
+    AUTHOR_SYNC_BATCH_SIZE: int = 500
+    # How long an outbox id gap may be an uncommitted event before it's skipped
+    AUTHOR_SYNC_COMMIT_LAG_SECONDS: float = 60.0
+    # Comments updated per transaction when refreshing one author
+    AUTHOR_SYNC_CHUNK_SIZE: int = 1000
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    # Recycle connections before RDS/PgBouncer idle timeouts close them
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Disable server-side prepared statements for PgBouncer transaction mode
+    DB_PGBOUNCER_COMPAT: bool = False
 
     class Config:
         env_file = ".env"
@@ -2,16 +2,31 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, Base, pool_metrics
+from app.services.token_cache import token_cache, run_jwks_refresher
 from app.routers import comments
+from app.services.stats_reconciler import run_stats_reconciler
+from app.services.author_sync import run_author_sync
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    background_tasks = [
+        asyncio.create_task(
+            run_stats_reconciler(settings.COMMENT_STATS_RECONCILE_INTERVAL_SECONDS)
+        ),
+        asyncio.create_task(run_author_sync(settings.AUTHOR_SYNC_INTERVAL_SECONDS)),
+        asyncio.create_task(run_jwks_refresher()),
+    ]
     yield
+    for task in background_tasks:
+        task.cancel()
+    await engine.dispose()
 
 
 app = FastAPI(
@@ -65,6 +80,16 @@ async def health_check():
     return {"status": "healthy", "service": settings.APP_NAME}
 
 
+@app.get("/metrics/pool")
+async def get_pool_metrics():
+    return {"service": settings.APP_NAME, **pool_metrics()}
+
+
+@app.get("/metrics/auth")
+async def get_auth_metrics():
+    return {"service": settings.APP_NAME, **token_cache.metrics()}
+
+
 @app.get("/")
 async def root():
     return {
@@ -1,6 +1,15 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, Boolean, DateTime
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    Boolean,
+    DateTime,
+    Integer,
+    BigInteger,
+    Index,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
 
@@ -23,3 +32,69 @@ class Comment(Base):
     author_username = Column(String(50), nullable=True)
     author_display_name = Column(String(100), nullable=True)
     author_avatar_url = Column(String(500), nullable=True)
+    # Materialized ancestry: dot-separated segments from the root comment down,
+    # each segment sorting siblings by creation time (see path_segment)
+    path = Column(Text(collation="C"), nullable=True)
+    depth = Column(Integer, nullable=True)
+
+
+# Partial indexes matching CommentService's reads, which all skip deleted rows.
+# Keep in step with scripts/migrate_comments_add_partial_indexes.sql.
+
+# Top-level comments of a post, newest first
+Index(
+    "idx_comments_post_roots_created_at",
+    Comment.post_id,
+    Comment.created_at.desc(),
+    postgresql_where=(Comment.parent_id.is_(None)) & (Comment.is_deleted == False),
+)
+
+# Every comment of a post in creation order
+Index(
+    "idx_comments_post_live_created_at",
+    Comment.post_id,
+    Comment.created_at,
+    postgresql_where=Comment.is_deleted == False,
+)
+
+# Direct replies of a comment in creation order
+Index(
+    "idx_comments_parent_live_created_at",
+    Comment.parent_id,
+    Comment.created_at,
+    postgresql_where=Comment.is_deleted == False,
+)
+
+# Subtree and thread-order scans are range scans on (post_id, path)
+Index(
+    "idx_comments_post_live_path",
+    Comment.post_id,
+    Comment.path,
+    postgresql_where=Comment.is_deleted == False,
+)
+
+
+class PostCommentStats(Base):
+    """Live (non-deleted) comment count per post, kept in step with comments."""
+
+    __tablename__ = "post_comment_stats"
+    __table_args__ = {"schema": "comments"}
+
+    post_id = Column(UUID(as_uuid=True), primary_key=True)
+    comment_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+
+class OutboxOffset(Base):
+    """Last outbox event id each consumer in this service has applied."""
+
+    __tablename__ = "outbox_offsets"
+    __table_args__ = {"schema": "comments"}
+
+    consumer = Column(String(100), primary_key=True)
+    last_event_id = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
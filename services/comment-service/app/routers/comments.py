@@ -1,9 +1,12 @@
 import uuid
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.database import get_db
 from app.schemas import (
+    CommentBulkItem,
     CommentCreate,
     CommentUpdate,
     APIResponse,
@@ -14,18 +17,18 @@ from app.routers.dependencies import get_current_user
 router = APIRouter(tags=["comments"])
 
 
-def get_comment_service(db: Session = Depends(get_db)):
+def get_comment_service(db: AsyncSession = Depends(get_db)):
     return CommentService(db)
 
 
 @router.post("")
-def create_comment(
+async def create_comment(
     comment_in: CommentCreate,
     current_user: dict = Depends(get_current_user),
     service: CommentService = Depends(get_comment_service),
 ):
     try:
-        comment = service.create(
+        comment = await service.create(
             obj_in=comment_in, author_id=uuid.UUID(current_user["user_id"])
         )
         comment_dict = service._comment_to_dict(comment)
@@ -34,14 +37,112 @@ def create_comment(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+async def _ndjson_lines(request: Request):
+    """
+    Yield (line number, raw line) from a streamed NDJSON request body. A line
+    longer than MAX_BULK_LINE_BYTES is yielded as None and never buffered.
+    """
+    parts, size, oversized, line_no = [], 0, False, 0
+    async for chunk in request.stream():
+        # Only the new chunk is split, so long lines cost linear time
+        pieces = chunk.split(b"\n")
+        for i, piece in enumerate(pieces):
+            if not oversized:
+                size += len(piece)
+                parts.append(piece)
+                if size > settings.MAX_BULK_LINE_BYTES:
+                    parts, oversized = [], True
+            if i < len(pieces) - 1:
+                line_no += 1
+                yield line_no, None if oversized else b"".join(parts)
+                parts, size, oversized = [], 0, False
+    if size or oversized:
+        yield line_no + 1, None if oversized else b"".join(parts)
+
+
+@router.post("/bulk")
+async def bulk_create_comments(
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+    service: CommentService = Depends(get_comment_service),
+):
+    """
+    Import comments from an NDJSON body, one CommentBulkItem per line, onto
+    posts the caller wrote. Rows are written in chunks as the body streams in;
+    the response has a result per line.
+    """
+    author_id = uuid.UUID(current_user["user_id"])
+    author_info = await service._fetch_author_info(author_id)
+
+    known, results, batch = {}, [], []
+    rows = 0
+    async for line_no, line in _ndjson_lines(request):
+        if line is not None and not line.strip():
+            continue
+        rows += 1
+        if rows > settings.MAX_BULK_COMMENTS:
+            results.append(
+                {
+                    "line": line_no,
+                    "client_id": None,
+                    "status": "error",
+                    "error": f"Import limited to {settings.MAX_BULK_COMMENTS} rows; "
+                    "this and later lines were skipped",
+                }
+            )
+            break
+        if line is None:
+            results.append(
+                {
+                    "line": line_no,
+                    "client_id": None,
+                    "status": "error",
+                    "error": f"Line longer than {settings.MAX_BULK_LINE_BYTES} bytes",
+                }
+            )
+            continue
+
+        try:
+            item = CommentBulkItem.model_validate_json(line)
+        except ValidationError as e:
+            error = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                if err["loc"]
+                else err["msg"]
+                for err in e.errors()
+            )
+            results.append(
+                {"line": line_no, "client_id": None, "status": "error", "error": error}
+            )
+            continue
+
+        batch.append((line_no, item))
+        if len(batch) >= settings.BULK_COMMENT_CHUNK_SIZE:
+            results += await service.bulk_create(batch, author_id, author_info, known)
+            batch = []
+
+    if batch:
+        results += await service.bulk_create(batch, author_id, author_info, known)
+
+    results.sort(key=lambda result: result["line"])
+    created = sum(result["status"] == "created" for result in results)
+    return APIResponse(
+        data={
+            "created": created,
+            "failed": len(results) - created,
+            "results": results,
+        }
+    )
+
+
 @router.get("/post/{post_id}")
-def get_comments_by_post(
+async def get_comments_by_post(
     post_id: uuid.UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     service: CommentService = Depends(get_comment_service),
 ):
-    result = service.get_by_post(post_id=post_id, page=page, page_size=page_size)
+    result = await service.get_by_post(post_id=post_id, page=page, page_size=page_size)
 
     items = [service._comment_to_dict(c) for c in result["items"]]
 
@@ -51,6 +152,7 @@ def get_comments_by_post(
         data={
             "items": items,
             "total": result["total"],
+            "total_is_exact": result["total_is_exact"],
             "page": result["page"],
             "page_size": result["page_size"],
             "total_pages": total_pages,
@@ -59,19 +161,80 @@ def get_comments_by_post(
 
 
 @router.get("/post/{post_id}/all")
-def get_all_comments_by_post(
+async def get_all_comments_by_post(
     post_id: uuid.UUID,
     service: CommentService = Depends(get_comment_service),
 ):
-    comments = service.get_all_comments_by_post(post_id)
+    comments = await service.get_all_comments_by_post(post_id)
 
     items = [service._comment_to_dict(c) for c in comments]
 
     return APIResponse(data={"items": items, "total": len(items)})
 
 
+@router.get("/post/{post_id}/threads")
+async def get_comment_threads_by_post(
+    post_id: uuid.UUID,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    replies: int = Query(None, ge=0, le=20),
+    service: CommentService = Depends(get_comment_service),
+):
+    result = await service.get_threads_by_post(
+        post_id=post_id, page=page, page_size=page_size, replies_per_thread=replies
+    )
+
+    items = []
+    for root, previews, reply_count in result["items"]:
+        item = service._comment_to_dict(root)
+        item["replies"] = [service._comment_to_dict(r) for r in previews]
+        item["reply_count"] = reply_count
+        item["has_more_replies"] = reply_count > len(previews)
+        items.append(item)
+
+    total_pages = (result["total"] + page_size - 1) // page_size
+
+    return APIResponse(
+        data={
+            "items": items,
+            "total": result["total"],
+            "total_is_exact": result["total_is_exact"],
+            "page": result["page"],
+            "page_size": result["page_size"],
+            "total_pages": total_pages,
+        }
+    )
+
+
+@router.get("/post/{post_id}/ordered")
+async def get_thread_ordered_comments(
+    post_id: uuid.UUID,
+    cursor: Optional[str] = Query(None, max_length=2000),
+    limit: int = Query(50, ge=1, le=100),
+    max_depth: Optional[int] = Query(None, ge=0),
+    service: CommentService = Depends(get_comment_service),
+):
+    comments = await service.get_thread_ordered(
+        post_id=post_id, after=cursor, limit=limit, max_depth=max_depth
+    )
+
+    items = []
+    for comment in comments:
+        item = service._comment_to_dict(comment)
+        item["depth"] = comment.depth
+        items.append(item)
+
+    return APIResponse(
+        data={
+            "items": items,
+            "limit": limit,
+            "next_cursor": comments[-1].path if len(comments) == limit else None,
+        }
+    )
+
+
 @router.post("/post/{post_id}")
-def create_comment_by_post(
+async def create_comment_by_post(
     post_id: uuid.UUID,
     comment_in: CommentCreate,
     current_user: dict = Depends(get_current_user),
@@ -84,7 +247,7 @@ def create_comment_by_post(
 
         comment_with_post = CommentCreateSchema(**comment_data)
 
-        comment = service.create(
+        comment = await service.create(
             obj_in=comment_with_post, author_id=uuid.UUID(current_user["user_id"])
         )
         comment_dict = service._comment_to_dict(comment)
@@ -93,33 +256,50 @@ def create_comment_by_post(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/counts")
+async def get_comment_counts(
+    post_ids: List[uuid.UUID] = Query(...),
+    service: CommentService = Depends(get_comment_service),
+):
+    if len(post_ids) > settings.MAX_BATCH_POST_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.MAX_BATCH_POST_IDS} post_ids per request",
+        )
+
+    counts = await service.get_comment_counts(post_ids)
+    return APIResponse(
+        data={"counts": {str(post_id): count for post_id, count in counts.items()}}
+    )
+
+
 @router.get("/{comment_id}")
-def get_comment(
+async def get_comment(
     comment_id: uuid.UUID,
     include_replies: bool = Query(True),
     service: CommentService = Depends(get_comment_service),
 ):
-    comment = service.get_by_id(comment_id)
+    comment = await service.get_by_id(comment_id)
     if not comment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
         )
 
     if include_replies:
-        comment_tree = service.build_comment_tree(comment)
+        comment_tree = await service.build_comment_tree(comment)
         return APIResponse(data=comment_tree)
 
     return APIResponse(data=service._comment_to_dict(comment))
 
 
 @router.put("/{comment_id}")
-def update_comment(
+async def update_comment(
     comment_id: uuid.UUID,
     comment_in: CommentUpdate,
     current_user: dict = Depends(get_current_user),
     service: CommentService = Depends(get_comment_service),
 ):
-    comment = service.get_by_id(comment_id)
+    comment = await service.get_by_id(comment_id)
     if not comment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
@@ -131,17 +311,17 @@ def update_comment(
             detail="Not authorized to update this comment",
         )
 
-    updated_comment = service.update(comment, comment_in)
+    updated_comment = await service.update(comment, comment_in)
     return APIResponse(data=service._comment_to_dict(updated_comment))
 
 
 @router.delete("/{comment_id}")
-def delete_comment(
+async def delete_comment(
     comment_id: uuid.UUID,
     current_user: dict = Depends(get_current_user),
     service: CommentService = Depends(get_comment_service),
 ):
-    success = service.delete(
+    success = await service.delete(
         comment_id=comment_id, author_id=uuid.UUID(current_user["user_id"])
     )
 
@@ -155,8 +335,8 @@ def delete_comment(
 
 
 @router.get("/post/{post_id}/count", response_model=APIResponse[dict])
-def get_comment_count(
+async def get_comment_count(
     post_id: uuid.UUID, service: CommentService = Depends(get_comment_service)
 ):
-    count = service.get_comment_count_by_post(post_id)
+    count = await service.get_comment_count_by_post(post_id)
     return APIResponse(data={"count": count})
@@ -1,7 +1,7 @@
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
-from app.config import settings
+from jose import JWTError
+from app.services.token_cache import token_cache
 
 security = HTTPBearer()
 
@@ -10,9 +10,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     token = credentials.credentials
 
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = token_cache.decode(token)
         user_id: str = payload.get("sub")
 
         if user_id is None:
@@ -13,6 +13,23 @@ class CommentCreate(CommentBase):
     parent_id: Optional[uuid.UUID] = None
 
 
+class CommentBulkItem(CommentBase):
+    """One NDJSON line of a bulk import."""
+
+    client_id: str = Field(..., min_length=1, max_length=100)
+    post_id: uuid.UUID
+    # Parent from earlier in the same import, or an existing comment
+    parent_client_id: Optional[str] = Field(None, min_length=1, max_length=100)
+    parent_id: Optional[uuid.UUID] = None
+    created_at: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_single_parent(self):
+        if self.parent_client_id and self.parent_id:
+            raise ValueError("Give parent_client_id or parent_id, not both")
+        return self
+
+
 class CommentUpdate(BaseModel):
     content: Optional[str] = Field(None, min_length=1, max_length=5000)
 
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+from sqlalchemy import func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.config import settings
+from app.database import engine
+from app.models import Comment, OutboxOffset
+
+logger = logging.getLogger(__name__)
+
+CONSUMER = "comment-author-sync"
+
+# Session-level advisory lock so only one worker applies profile events
+AUTHOR_SYNC_LOCK_ID = 0x617574686F72
+
+
+async def _refresh_author(conn: AsyncConnection, user_id, profile) -> int:
+    """Copy one author's current profile onto their comments, in chunks."""
+    username, display_name, avatar_url = profile or (None, None, None)
+    stale = select(Comment.id).where(
+        Comment.author_id == user_id,
+        or_(
+            Comment.author_username.is_distinct_from(username),
+            Comment.author_display_name.is_distinct_from(display_name),
+            Comment.author_avatar_url.is_distinct_from(avatar_url),
+        ),
+    )
+
+    updated = 0
+    while True:
+        # Short transactions so a prolific author never holds long row locks
+        result = await conn.execute(
+            update(Comment)
+            .where(
+                Comment.id.in_(
+                    stale.limit(settings.AUTHOR_SYNC_CHUNK_SIZE).scalar_subquery()
+                )
+            )
+            .values(
+                author_username=username,
+                author_display_name=display_name,
+                author_avatar_url=avatar_url,
+                # Not an edit by the author
+                updated_at=Comment.updated_at,
+            )
+        )
+        await conn.commit()
+        updated += result.rowcount
+        if result.rowcount < settings.AUTHOR_SYNC_CHUNK_SIZE:
+            return updated
+
+
+def _safe_offset(last_event_id: int, events) -> int:
+    """
+    Highest event id the consumer can move past. Ids are handed out before
+    the writing transaction commits, so a gap may be an event still to
+    come; it is skipped only once the event after it is older than
+    AUTHOR_SYNC_COMMIT_LAG_SECONDS, by when it was rolled back.
+    """
+    offset = last_event_id
+    for event_id, _, settled in events:
+        if event_id != offset + 1 and not settled:
+            break
+        offset = event_id
+    return offset
+
+
+async def sync_authors_once(conn: AsyncConnection) -> int:
+    """
+    Apply pending profile events. Returns the number of events the offset
+    moved past; events above a gap are applied but read again next time.
+    """
+    await conn.execute(
+        insert(OutboxOffset)
+        .values(consumer=CONSUMER, last_event_id=0)
+        .on_conflict_do_nothing()
+    )
+    last_event_id = await conn.scalar(
+        select(OutboxOffset.last_event_id).where(OutboxOffset.consumer == CONSUMER)
+    )
+
+    events = (
+        await conn.execute(
+            text(
+                "SELECT id, user_id, "
+                "created_at < now() - make_interval(secs => :lag) AS settled "
+                "FROM users.profile_events "
+                "WHERE id > :last_event_id ORDER BY id LIMIT :limit"
+            ),
+            {
+                "last_event_id": last_event_id,
+                "lag": settings.AUTHOR_SYNC_COMMIT_LAG_SECONDS,
+                "limit": settings.AUTHOR_SYNC_BATCH_SIZE,
+            },
+        )
+    ).all()
+    if not events:
+        await conn.commit()
+        return 0
+
+    # Events only say who changed; the profile row is the source of truth, so
+    # repeated changes by one user collapse into a single refresh, and
+    # applying an event again is harmless
+    user_ids = list({user_id for _, user_id, _ in events})
+    profiles = {
+        row[0]: row[1:]
+        for row in await conn.execute(
+            text(
+                "SELECT user_id, username, display_name, avatar_url "
+                "FROM users.profiles WHERE user_id = ANY(:user_ids)"
+            ),
+            {"user_ids": user_ids},
+        )
+    }
+    await conn.commit()
+
+    updated = 0
+    for user_id in user_ids:
+        updated += await _refresh_author(conn, user_id, profiles.get(user_id))
+
+    offset = _safe_offset(last_event_id, events)
+    advanced = sum(1 for event_id, _, _ in events if event_id <= offset)
+    if advanced:
+        await conn.execute(
+            update(OutboxOffset)
+            .where(OutboxOffset.consumer == CONSUMER)
+            .values(last_event_id=offset, updated_at=func.now())
+        )
+    await conn.commit()
+    if advanced or updated:
+        logger.info(
+            f"Applied {len(events)} profile events, refreshed {updated} comments"
+        )
+    return advanced
+
+
+async def prune_profile_events(conn: AsyncConnection) -> int:
+    """Delete profile events every consumer has moved past, in chunks."""
+    pruned = 0
+    while True:
+        result = await conn.execute(
+            text(
+                "DELETE FROM users.profile_events WHERE id IN ("
+                "SELECT id FROM users.profile_events "
+                "WHERE id <= (SELECT min(last_event_id) FROM comments.outbox_offsets) "
+                "ORDER BY id LIMIT :limit)"
+            ),
+            {"limit": settings.AUTHOR_SYNC_CHUNK_SIZE},
+        )
+        await conn.commit()
+        pruned += result.rowcount
+        if result.rowcount < settings.AUTHOR_SYNC_CHUNK_SIZE:
+            return pruned
+
+
+async def run_author_sync(interval: float):
+    """
+    Poll the users.profile_events outbox, refresh denormalized authors and
+    delete the events that have been applied.
+    """
+    while True:
+        try:
+            async with engine.connect() as conn:
+                locked = await conn.scalar(
+                    select(func.pg_try_advisory_lock(AUTHOR_SYNC_LOCK_ID))
+                )
+                if locked:
+                    try:
+                        # Drain a backlog without waiting between batches
+                        while (
+                            await sync_authors_once(conn)
+                            == settings.AUTHOR_SYNC_BATCH_SIZE
+                        ):
+                            pass
+                        await prune_profile_events(conn)
+                    finally:
+                        await conn.rollback()
+                        await conn.execute(
+                            select(func.pg_advisory_unlock(AUTHOR_SYNC_LOCK_ID))
+                        )
+                        await conn.commit()
+        except Exception as e:
+            logger.error(f"Error syncing comment authors: {e}")
+        await asyncio.sleep(interval)
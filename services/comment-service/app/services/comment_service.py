@@ -1,24 +1,47 @@
 import uuid
+from collections import defaultdict
 from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, text
-from app.models import Comment
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import Comment, PostCommentStats
 from app.schemas import CommentCreate, CommentUpdate
 from app.config import settings
+from app.services.count_service import count_rows
+from datetime import datetime, timedelta, timezone
 import httpx
 
+EPOCH = datetime(1970, 1, 1)
+
+# Advisory lock so only one worker reconciles comment counters at a time
+STATS_RECONCILE_LOCK_ID = 0x636F6D6D656E74
+
+
+def path_segment(created_at: datetime, comment_id: uuid.UUID) -> str:
+    """
+    Fixed-width path segment for a comment: microseconds since the epoch in
+    hex, then the comment id. Sorting segments sorts siblings by creation time.
+    """
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    micros = (created_at - EPOCH) // timedelta(microseconds=1)
+    return f"{micros:014x}{comment_id.hex}"
+
 
 class CommentService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def _fetch_author_info(self, user_id: uuid.UUID) -> dict:
+    async def _fetch_author_info(self, user_id: uuid.UUID) -> dict:
         try:
-            result = self.db.execute(
-                text(
-                    "SELECT username, display_name, avatar_url FROM users.profiles WHERE user_id = :user_id"
-                ),
-                {"user_id": str(user_id)},
+            result = (
+                await self.db.execute(
+                    text(
+                        "SELECT username, display_name, avatar_url FROM users.profiles WHERE user_id = :user_id"
+                    ),
+                    {"user_id": user_id},
+                )
             ).fetchone()
             if result:
                 return {
@@ -30,19 +53,19 @@ class CommentService:
             pass
         return {"username": None, "display_name": None, "avatar_url": None}
 
-    def get_by_id(self, comment_id: uuid.UUID) -> Optional[Comment]:
-        return (
-            self.db.query(Comment)
-            .filter(Comment.id == comment_id, Comment.is_deleted == False)
-            .first()
+    async def get_by_id(self, comment_id: uuid.UUID) -> Optional[Comment]:
+        return await self.db.scalar(
+            select(Comment).where(Comment.id == comment_id, Comment.is_deleted == False)
         )
 
-    def get_by_post(self, post_id: uuid.UUID, page: int = 1, page_size: int = None):
+    async def get_by_post(
+        self, post_id: uuid.UUID, page: int = 1, page_size: int = None
+    ):
         page_size = page_size or settings.DEFAULT_PAGE_SIZE
 
         query = (
-            self.db.query(Comment)
-            .filter(
+            select(Comment)
+            .where(
                 Comment.post_id == post_id,
                 Comment.parent_id == None,
                 Comment.is_deleted == False,
@@ -50,33 +73,139 @@ class CommentService:
             .order_by(desc(Comment.created_at))
         )
 
-        total = query.count()
-        comments = query.offset((page - 1) * page_size).limit(page_size).all()
+        total, total_is_exact = await count_rows(self.db, query)
+        comments = (
+            await self.db.scalars(query.offset((page - 1) * page_size).limit(page_size))
+        ).all()
+
+        return {
+            "items": comments,
+            "total": total,
+            "total_is_exact": total_is_exact,
+            "page": page,
+            "page_size": page_size,
+        }
+
+    async def get_threads_by_post(
+        self,
+        post_id: uuid.UUID,
+        page: int = 1,
+        page_size: int = None,
+        replies_per_thread: int = None,
+    ):
+        """
+        A page of top-level comments, each with its first few direct replies
+        and its total reply count. Uses a fixed number of queries however
+        large the threads are.
+        """
+        page_size = page_size or settings.DEFAULT_PAGE_SIZE
+        if replies_per_thread is None:
+            replies_per_thread = settings.THREAD_REPLY_PREVIEW
+
+        result = await self.get_by_post(post_id, page=page, page_size=page_size)
+        root_ids = [root.id for root in result["items"]]
+
+        previews = defaultdict(list)
+        reply_counts = {}
+        if root_ids:
+            ranked = (
+                select(
+                    Comment.id,
+                    func.row_number()
+                    .over(partition_by=Comment.parent_id, order_by=Comment.created_at)
+                    .label("position"),
+                    func.count()
+                    .over(partition_by=Comment.parent_id)
+                    .label("reply_count"),
+                )
+                .where(Comment.parent_id.in_(root_ids), Comment.is_deleted == False)
+                .subquery()
+            )
+            # Keep at least one row per thread so its reply count comes back
+            # even when no previews are requested
+            rows = (
+                await self.db.execute(
+                    select(Comment, ranked.c.reply_count)
+                    .join(ranked, Comment.id == ranked.c.id)
+                    .where(ranked.c.position <= max(replies_per_thread, 1))
+                    .order_by(Comment.created_at)
+                )
+            ).all()
+            for reply, reply_count in rows:
+                reply_counts[reply.parent_id] = reply_count
+                if len(previews[reply.parent_id]) < replies_per_thread:
+                    previews[reply.parent_id].append(reply)
+
+        result["items"] = [
+            (root, previews[root.id], reply_counts.get(root.id, 0))
+            for root in result["items"]
+        ]
+        return result
 
-        return {"items": comments, "total": total, "page": page, "page_size": page_size}
+    async def get_replies(self, comment_id: uuid.UUID) -> List[Comment]:
+        return (
+            await self.db.scalars(
+                select(Comment)
+                .where(Comment.parent_id == comment_id, Comment.is_deleted == False)
+                .order_by(Comment.created_at)
+            )
+        ).all()
 
-    def get_replies(self, comment_id: uuid.UUID) -> List[Comment]:
+    async def get_subtree(self, comment: Comment, max_depth: int) -> list:
+        """All live descendants down to ``max_depth`` levels, in thread order."""
         return (
-            self.db.query(Comment)
-            .filter(Comment.parent_id == comment_id, Comment.is_deleted == False)
-            .order_by(Comment.created_at)
-            .all()
+            await self.db.scalars(
+                select(Comment)
+                .where(
+                    Comment.post_id == comment.post_id,
+                    # "/" sorts right after ".", so this covers every path
+                    # that starts with the comment's own path plus "."
+                    Comment.path > comment.path + ".",
+                    Comment.path < comment.path + "/",
+                    Comment.depth <= comment.depth + max_depth,
+                    Comment.is_deleted == False,
+                )
+                .order_by(Comment.path)
+            )
+        ).all()
+
+    async def get_thread_ordered(
+        self,
+        post_id: uuid.UUID,
+        after: Optional[str] = None,
+        limit: int = None,
+        max_depth: Optional[int] = None,
+    ) -> List[Comment]:
+        """
+        Comments for a post flattened in thread order (each comment followed by
+        its replies), paginated by the path of the last comment seen.
+        """
+        limit = limit or settings.DEFAULT_PAGE_SIZE
+        query = select(Comment).where(
+            Comment.post_id == post_id, Comment.is_deleted == False
         )
+        if after:
+            query = query.where(Comment.path > after)
+        if max_depth is not None:
+            query = query.where(Comment.depth <= max_depth)
+        return (await self.db.scalars(query.order_by(Comment.path).limit(limit))).all()
 
-    def build_comment_tree(
-        self, comment: Comment, depth: int = 0, max_depth: int = 5
-    ) -> dict:
-        if depth >= max_depth:
-            return self._comment_to_dict(comment)
+    async def build_comment_tree(self, comment: Comment, max_depth: int = 5) -> dict:
+        descendants = await self.get_subtree(comment, max_depth)
 
-        replies = self.get_replies(comment.id)
-        reply_trees = [
-            self.build_comment_tree(reply, depth + 1, max_depth) for reply in replies
-        ]
+        children = defaultdict(list)
+        for reply in descendants:
+            children[reply.parent_id].append(reply)
 
-        result = self._comment_to_dict(comment)
-        result["replies"] = reply_trees
-        return result
+        def assemble(node: Comment, depth: int) -> dict:
+            result = self._comment_to_dict(node)
+            if depth < max_depth:
+                result["replies"] = [
+                    assemble(reply, depth + 1) for reply in children[node.id]
+                ]
+            return result
+
+        return assemble(comment, 0)
 
     def _comment_to_dict(self, comment: Comment) -> dict:
         return {
@@ -99,15 +228,29 @@ class CommentService:
             "edited": comment.edited_at is not None,
         }
 
-    def create(self, obj_in: CommentCreate, author_id: uuid.UUID) -> Comment:
+    async def create(self, obj_in: CommentCreate, author_id: uuid.UUID) -> Comment:
         if obj_in.parent_id:
-            parent = self.get_by_id(obj_in.parent_id)
+            parent = await self.get_by_id(obj_in.parent_id)
             if not parent or parent.post_id != obj_in.post_id:
                 raise ValueError("Invalid parent comment")
+            if parent.depth >= settings.MAX_COMMENT_DEPTH:
+                raise ValueError(
+                    f"Replies can be nested at most {settings.MAX_COMMENT_DEPTH} "
+                    "levels deep"
+                )
+
+        author_info = await self._fetch_author_info(author_id)
 
-        author_info = self._fetch_author_info(author_id)
+        comment_id = uuid.uuid4()
+        created_at = datetime.utcnow()
+        segment = path_segment(created_at, comment_id)
 
         db_obj = Comment(
+            id=comment_id,
+            created_at=created_at,
+            updated_at=created_at,
+            path=f"{parent.path}.{segment}" if obj_in.parent_id else segment,
+            depth=parent.depth + 1 if obj_in.parent_id else 0,
             post_id=obj_in.post_id,
             author_id=author_id,
             parent_id=obj_in.parent_id,
@@ -118,50 +261,261 @@ class CommentService:
             author_avatar_url=author_info.get("avatar_url"),
         )
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        await self._adjust_comment_count(obj_in.post_id, 1)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
         return db_obj
 
-    def update(self, db_obj: Comment, obj_in: CommentUpdate) -> Comment:
-        from datetime import datetime
+    async def bulk_create(
+        self,
+        items: List[tuple],
+        author_id: uuid.UUID,
+        author_info: dict,
+        known: dict,
+    ) -> List[dict]:
+        """
+        Insert one chunk of a bulk import in a single transaction.
+
+        ``items`` holds (line number, CommentBulkItem) pairs. ``known`` maps the
+        client ids written by earlier chunks of the same import to
+        (id, post_id, path, depth) and is extended in place. Returns one result
+        per item. Only comments on posts written by ``author_id`` are imported.
+        """
+        post_ids = list({item.post_id for _, item in items})
+        own_posts = set(
+            (
+                await self.db.execute(
+                    text(
+                        "SELECT id FROM posts.posts "
+                        "WHERE id = ANY(:post_ids) AND author_id = :author_id"
+                    ),
+                    {"post_ids": post_ids, "author_id": author_id},
+                )
+            ).scalars()
+        )
+
+        parent_ids = {item.parent_id for _, item in items if item.parent_id}
+        existing = {}
+        if parent_ids:
+            rows = await self.db.execute(
+                select(Comment.id, Comment.post_id, Comment.path, Comment.depth).where(
+                    Comment.id.in_(parent_ids), Comment.is_deleted == False
+                )
+            )
+            existing = {row[0]: tuple(row) for row in rows}
+
+        now = datetime.utcnow()
+        results, values, created = [], [], {}
+        per_post = defaultdict(int)
+        for line, item in items:
+            result = {"line": line, "client_id": item.client_id}
+            results.append(result)
+
+            if item.client_id in known or item.client_id in created:
+                result.update(status="error", error="Duplicate client_id")
+                continue
+
+            if item.post_id not in own_posts:
+                result.update(
+                    status="error", error="Comments can only be imported to your posts"
+                )
+                continue
+
+            parent = None
+            if item.parent_client_id:
+                parent = created.get(item.parent_client_id) or known.get(
+                    item.parent_client_id
+                )
+            elif item.parent_id:
+                parent = existing.get(item.parent_id)
+            has_parent = item.parent_client_id or item.parent_id
+            if has_parent and (not parent or parent[1] != item.post_id):
+                result.update(status="error", error="Invalid parent comment")
+                continue
+            if parent and parent[3] >= settings.MAX_COMMENT_DEPTH:
+                result.update(
+                    status="error",
+                    error=f"Replies can be nested at most {settings.MAX_COMMENT_DEPTH} "
+                    "levels deep",
+                )
+                continue
 
+            comment_id = uuid.uuid4()
+            created_at = item.created_at or now
+            if created_at.tzinfo is not None:
+                created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+            if created_at > now:
+                # Threads sort newest first; a future date would pin the comment
+                result.update(status="error", error="created_at is in the future")
+                continue
+            segment = path_segment(created_at, comment_id)
+            path = f"{parent[2]}.{segment}" if parent else segment
+            depth = parent[3] + 1 if parent else 0
+
+            values.append(
+                {
+                    "id": comment_id,
+                    "post_id": item.post_id,
+                    "author_id": author_id,
+                    "parent_id": parent[0] if parent else None,
+                    "content": item.content,
+                    "is_deleted": False,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "path": path,
+                    "depth": depth,
+                    "author_username": author_info.get("username"),
+                    "author_display_name": author_info.get("display_name"),
+                    "author_avatar_url": author_info.get("avatar_url"),
+                }
+            )
+            created[item.client_id] = (comment_id, item.post_id, path, depth)
+            per_post[item.post_id] += 1
+            result.update(status="created", id=str(comment_id))
+
+        if not values:
+            return results
+
+        try:
+            # render_nulls keeps rows with and without a parent in the same
+            # multi-row INSERT instead of splitting batches on NULL columns
+            await self.db.execute(
+                insert(Comment).execution_options(render_nulls=True), values
+            )
+            for post_id, count in per_post.items():
+                await self._adjust_comment_count(post_id, count)
+            await self.db.commit()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            error = f"Write failed: {getattr(e, 'orig', None) or e}"
+            for result in results:
+                if result["status"] == "created":
+                    result.update(status="error", error=error)
+                    del result["id"]
+            return results
+
+        known.update(created)
+        return results
+
+    async def update(self, db_obj: Comment, obj_in: CommentUpdate) -> Comment:
         if obj_in.content is not None:
             db_obj.content = obj_in.content
             db_obj.edited_at = datetime.utcnow()
 
-        self.db.commit()
-        self.db.refresh(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
         return db_obj
 
-    def delete(self, comment_id: uuid.UUID, author_id: uuid.UUID) -> bool:
-        comment = (
-            self.db.query(Comment)
-            .filter(
+    async def delete(self, comment_id: uuid.UUID, author_id: uuid.UUID) -> bool:
+        comment = await self.db.scalar(
+            select(Comment).where(
                 Comment.id == comment_id,
                 Comment.author_id == author_id,
                 Comment.is_deleted == False,
             )
-            .first()
         )
 
         if not comment:
             return False
 
         comment.is_deleted = True
-        self.db.commit()
+        await self._adjust_comment_count(comment.post_id, -1)
+        await self.db.commit()
         return True
 
-    def get_comment_count_by_post(self, post_id: uuid.UUID) -> int:
-        return (
-            self.db.query(Comment)
-            .filter(Comment.post_id == post_id, Comment.is_deleted == False)
-            .count()
+    async def _adjust_comment_count(self, post_id: uuid.UUID, delta: int):
+        # Runs in the caller's transaction so the counter commits with the comment
+        stmt = insert(PostCommentStats).values(
+            post_id=post_id, comment_count=max(delta, 0), updated_at=datetime.utcnow()
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[PostCommentStats.post_id],
+                set_={
+                    "comment_count": func.greatest(
+                        PostCommentStats.comment_count + delta, 0
+                    ),
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
         )
 
-    def get_all_comments_by_post(self, post_id: uuid.UUID) -> List[Comment]:
-        return (
-            self.db.query(Comment)
-            .filter(Comment.post_id == post_id, Comment.is_deleted == False)
-            .order_by(Comment.created_at)
-            .all()
+    async def get_comment_count_by_post(self, post_id: uuid.UUID) -> int:
+        counts = await self.get_comment_counts([post_id])
+        return counts[post_id]
+
+    async def get_comment_counts(self, post_ids: List[uuid.UUID]) -> dict:
+        rows = await self.db.execute(
+            select(PostCommentStats.post_id, PostCommentStats.comment_count).where(
+                PostCommentStats.post_id.in_(post_ids)
+            )
         )
+        counts = dict.fromkeys(post_ids, 0)
+        counts.update(rows.all())
+        return counts
+
+    async def reconcile_comment_counts(self) -> int:
+        """
+        Recompute every post's counter from comments.comments and add the
+        difference to the ones that drifted. Returns the number of counters
+        repaired, or -1 if another worker is already reconciling.
+
+        Counts and counters are read in one statement and a comment commits
+        with its counter change, so the difference leaves out comments in
+        flight, and adding it keeps any counter changes committed meanwhile.
+        """
+        locked = await self.db.scalar(
+            select(func.pg_try_advisory_xact_lock(STATS_RECONCILE_LOCK_ID))
+        )
+        if not locked:
+            await self.db.rollback()
+            return -1
+
+        actual = (
+            select(
+                Comment.post_id,
+                func.count().filter(Comment.is_deleted == False).label("comment_count"),
+            )
+            .group_by(Comment.post_id)
+            .subquery()
+        )
+        stored = PostCommentStats.__table__.alias("stored")
+        drift = func.coalesce(actual.c.comment_count, 0) - func.coalesce(
+            stored.c.comment_count, 0
+        )
+        # Includes posts whose comments were all hard-deleted
+        drifted = (
+            select(
+                func.coalesce(actual.c.post_id, stored.c.post_id),
+                drift,
+                func.now(),
+            )
+            .select_from(
+                actual.join(stored, actual.c.post_id == stored.c.post_id, full=True)
+            )
+            .where(drift != 0)
+        )
+        stmt = insert(PostCommentStats).from_select(
+            ["post_id", "comment_count", "updated_at"], drifted
+        )
+        repaired = await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[PostCommentStats.post_id],
+                set_={
+                    "comment_count": PostCommentStats.comment_count
+                    + stmt.excluded.comment_count,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+        await self.db.commit()
+        return repaired.rowcount
+
+    async def get_all_comments_by_post(self, post_id: uuid.UUID) -> List[Comment]:
+        return (
+            await self.db.scalars(
+                select(Comment)
+                .where(Comment.post_id == post_id, Comment.is_deleted == False)
+                .order_by(Comment.created_at)
+            )
+        ).all()
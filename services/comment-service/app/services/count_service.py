@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+
+_CACHE_MAX_ENTRIES = 1024
+
+# query key -> (expires_at, total)
+_count_cache: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _query_key(query: Select) -> str:
+    compiled = query.compile()
+    return f"{compiled}|{sorted(compiled.params.items())!r}"
+
+
+def _cache_get(key: str) -> Optional[int]:
+    with _cache_lock:
+        entry = _count_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, total = entry
+        if expires_at < time.monotonic():
+            del _count_cache[key]
+            return None
+        return total
+
+
+def _cache_set(key: str, total: int) -> None:
+    with _cache_lock:
+        _count_cache[key] = (time.monotonic() + settings.COUNT_CACHE_TTL_SECONDS, total)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > _CACHE_MAX_ENTRIES:
+            _count_cache.popitem(last=False)
+
+
+async def estimated_row_count(db: AsyncSession, table: str) -> Optional[int]:
+    """Planner row estimate for a table from pg_class.reltuples.
+
+    Returns None when the table has never been analyzed.
+    """
+    result = await db.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table},
+    )
+    if result is None or result < 0:
+        return None
+    return int(result)
+
+
+async def _count(db: AsyncSession, query: Select) -> int:
+    return await db.scalar(select(func.count()).select_from(query.subquery()))
+
+
+async def count_rows(
+    db: AsyncSession, query: Select, table: Optional[str] = None
+) -> tuple:
+    """Count the rows matched by ``query`` without always paying for a full scan.
+
+    Returns ``(total, exact)``. Only totals above COUNT_EXACT_THRESHOLD are
+    cached, so a cache hit is served before any counting. Otherwise small
+    result sets are counted exactly with a bounded scan, and larger ones get
+    a full count that is cached for COUNT_CACHE_TTL_SECONDS and reported as
+    estimated when served from the cache.
+
+    ``table`` is only for unfiltered queries over a whole table (such as
+    listing every profile): once the planner estimates it above the
+    threshold, that estimate is returned without scanning at all.
+    """
+    threshold = settings.COUNT_EXACT_THRESHOLD
+
+    if table is not None:
+        estimate = await estimated_row_count(db, table)
+        if estimate is not None and estimate > threshold:
+            return estimate, False
+
+    key = _query_key(query)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached, False
+
+    bounded = await _count(db, query.limit(threshold + 1))
+    if bounded <= threshold:
+        return bounded, True
+
+    total = await _count(db, query)
+    _cache_set(key, total)
+    return total, True
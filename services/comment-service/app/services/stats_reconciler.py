@@ -0,0 +1,19 @@
+import asyncio
+import logging
+from app.database import SessionLocal
+from app.services.comment_service import CommentService
+
+logger = logging.getLogger(__name__)
+
+
+async def run_stats_reconciler(interval: float):
+    """Periodically repair drift in comments.post_comment_stats."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with SessionLocal() as db:
+                repaired = await CommentService(db).reconcile_comment_counts()
+            if repaired > 0:
+                logger.warning(f"Repaired {repaired} drifted post comment counters")
+        except Exception as e:
+            logger.error(f"Error reconciling comment counters: {e}")
@@ -93,6 +93,9 @@ export const useAuthStore = defineStore('auth', () => {
       
       token.value = response.data.access_token
       localStorage.setItem('token', response.data.access_token)
+      // Refresh tokens are single use; the old one is now revoked
+      refreshToken.value = response.data.refresh_token
+      localStorage.setItem('refreshToken', response.data.refresh_token)
       return true
     } catch (err) {
       clearAuth()
@@ -36,6 +36,7 @@ export const usePostsStore = defineStore('posts', () => {
       const response = await api.get(`/posts/?${queryParams}`)
       // API returns { success, data: { items, pagination }, message, errors }
       const responseData = response.data.data || response.data
+      await applyLikeSummaries(responseData.items || [])
       
       if (params.page === 1 || !params.page) {
         posts.value = responseData.items || []
@@ -95,13 +96,38 @@ export const usePostsStore = defineStore('posts', () => {
     }
   }
 
+  // One request for the like counts (and status, when signed in) of many posts
+  const fetchLikeSummaries = async (slugs) => {
+    if (!slugs.length) return {}
+    const response = await api.post('/likes/batch', { post_slugs: slugs })
+    const summaries = {}
+    for (const item of response.data.data?.items || []) {
+      summaries[item.post_slug] = item
+    }
+    return summaries
+  }
+
+  const applyLikeSummaries = async (items) => {
+    try {
+      const summaries = await fetchLikeSummaries(items.map(p => p.slug))
+      for (const post of items) {
+        const summary = summaries[post.slug]
+        if (summary) {
+          post.likes_count = summary.count
+          post.is_liked = summary.liked_by_me || false
+        }
+      }
+    } catch (err) {
+      console.error('Failed to fetch like summaries:', err)
+    }
+  }
+
   const getLikeStatus = async (slug) => {
     try {
-      const response = await api.get(`/likes/status?post_slug=${slug}`)
-      const countResponse = await api.get(`/likes/count?post_slug=${slug}`)
+      const summary = (await fetchLikeSummaries([slug]))[slug]
       return {
-        liked: response.data.data?.liked || false,
-        count: countResponse.data.data?.count || 0
+        liked: summary?.liked_by_me || false,
+        count: summary?.count || 0
       }
     } catch (err) {
       console.error('Failed to get like status:', err)
@@ -287,6 +313,7 @@ export const usePostsStore = defineStore('posts', () => {
     likePost,
     unlikePost,
     getLikeStatus,
+    fetchLikeSummaries,
     resetPosts
   }
 })
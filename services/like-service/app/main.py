@@ -1,13 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import likes
-from app.database import Base, engine
+from app.database import Base, engine, pool_metrics
+from app.services.token_cache import token_cache, run_jwks_refresher
+from app.services.stats_reconciler import run_stats_reconciler
+from app.services.slug_cache import slug_cache, run_slug_invalidator
+from app.config import get_settings
+import asyncio
 import logging
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 app = FastAPI(
     title="Blogin Like Service",
@@ -29,15 +35,28 @@ app.add_middleware(
 async def startup_event():
     logger.info("Starting up Like Service...")
     try:
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created/verified")
     except Exception as e:
         logger.error(f"Error creating tables: {e}")
 
+    app.state.stats_reconciler = asyncio.create_task(
+        run_stats_reconciler(settings.LIKE_STATS_RECONCILE_INTERVAL_SECONDS)
+    )
+    app.state.slug_invalidator = asyncio.create_task(
+        run_slug_invalidator(settings.SLUG_CACHE_INVALIDATION_INTERVAL_SECONDS)
+    )
+    app.state.jwks_refresher = asyncio.create_task(run_jwks_refresher())
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Like Service...")
+    app.state.jwks_refresher.cancel()
+    app.state.stats_reconciler.cancel()
+    app.state.slug_invalidator.cancel()
+    await engine.dispose()
 
 
 @app.get("/health")
@@ -45,6 +64,21 @@ async def health_check():
     return {"status": "healthy", "service": "like-service"}
 
 
+@app.get("/metrics/pool")
+async def get_pool_metrics():
+    return {"service": "like-service", **pool_metrics()}
+
+
+@app.get("/metrics/auth")
+async def get_auth_metrics():
+    return {"service": "like-service", **token_cache.metrics()}
+
+
+@app.get("/metrics/slug-cache")
+async def get_slug_cache_metrics():
+    return {"service": "like-service", **slug_cache.metrics()}
+
+
 app.include_router(likes.router, prefix="/likes")
 
 if __name__ == "__main__":
@@ -1,4 +1,14 @@
-from sqlalchemy import Column, DateTime, UniqueConstraint, String, Text, Integer
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    UniqueConstraint,
+    String,
+    Text,
+    Index,
+    Integer,
+    SmallInteger,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.database import Base
@@ -24,6 +34,19 @@ class Post(Base):
     published_at = Column(DateTime(timezone=True), nullable=True)
 
 
+class PostEvent(Base):
+    """Read-only mirror of the post-service slug change outbox."""
+
+    __tablename__ = "post_events"
+    __table_args__ = {"schema": "posts"}
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    post_id = Column(UUID(as_uuid=True), nullable=False)
+    slug = Column(String(255), nullable=False)
+    event_type = Column(String(50), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class Like(Base):
     __tablename__ = "likes"
     __table_args__ = (
@@ -35,3 +58,30 @@ class Like(Base):
     post_id = Column(UUID(as_uuid=True), nullable=False)
     user_id = Column(UUID(as_uuid=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# A user's liked-posts feed: newest first, keyset on (created_at, id)
+Index(
+    "idx_likes_user_created_at",
+    Like.user_id,
+    Like.created_at.desc(),
+    Like.id.desc(),
+)
+# Streaming a post's likers in like order
+Index("idx_likes_post_created_at", Like.post_id, Like.created_at, Like.id)
+
+
+class PostLikeCount(Base):
+    """
+    One shard of a post's like counter. A post's count is the sum of its
+    shards, so concurrent likes on a popular post update different rows.
+    """
+
+    __tablename__ = "post_like_counts"
+    __table_args__ = {"schema": "likes"}
+
+    post_id = Column(UUID(as_uuid=True), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, default=0)
+    # A single shard can go negative when unlikes land on a different shard
+    like_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,30 +1,44 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import json
 import uuid
-from jose import jwt, JWTError
+from jose import JWTError
 
 from app.database import get_db
-from app.schemas import LikeCreate, APIResponse, LikeCountResponse, LikeStatusResponse
+from app.schemas import (
+    LikeCreate,
+    LikeBatchRequest,
+    APIResponse,
+    LikeCountResponse,
+    LikeStatusResponse,
+)
 from app.services.like_service import (
     create_like,
     delete_like,
     get_like_count,
+    get_like_summaries,
+    get_liked_posts,
+    get_post_author_id,
+    next_cursor,
+    stream_post_likers,
     has_user_liked,
     get_post_id_by_slug,
 )
 from app.config import get_settings
+from app.services.token_cache import token_cache
 
 router = APIRouter(tags=["Likes"])
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 settings = get_settings()
 
 
 def get_current_user_id(token: str) -> uuid.UUID:
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = token_cache.decode(token)
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -41,18 +55,18 @@ def get_current_user_id(token: str) -> uuid.UUID:
 async def like_post(
     like_data: LikeCreate,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Like a post (requires authentication)"""
     token = credentials.credentials
     user_id = get_current_user_id(token)
 
     # Look up post ID from slug
-    post_id = get_post_id_by_slug(db, like_data.post_slug)
+    post_id = await get_post_id_by_slug(db, like_data.post_slug)
     if not post_id:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    like = create_like(db, user_id, post_id)
+    like = await create_like(db, user_id, post_id)
     if not like:
         raise HTTPException(status_code=409, detail="You have already liked this post")
 
@@ -74,18 +88,18 @@ async def like_post(
 async def unlike_post(
     post_slug: str,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Unlike a post (requires authentication)"""
     token = credentials.credentials
     user_id = get_current_user_id(token)
 
     # Look up post ID from slug
-    post_id = get_post_id_by_slug(db, post_slug)
+    post_id = await get_post_id_by_slug(db, post_slug)
     if not post_id:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    deleted = delete_like(db, user_id, post_id)
+    deleted = await delete_like(db, user_id, post_id)
     if not deleted:
         raise HTTPException(
             status_code=404, detail="Like not found or you don't have permission"
@@ -102,15 +116,15 @@ async def unlike_post(
 @router.get("/count", response_model=APIResponse)
 async def get_likes_count(
     post_slug: str = Query(..., description="Post slug to get likes count for"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get total likes count for a post (public)"""
     # Look up post ID from slug
-    post_id = get_post_id_by_slug(db, post_slug)
+    post_id = await get_post_id_by_slug(db, post_slug)
     if not post_id:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    count = get_like_count(db, post_id)
+    count = await get_like_count(db, post_id)
 
     return APIResponse(
         success=True,
@@ -127,18 +141,18 @@ async def get_likes_count(
 async def check_like_status(
     post_slug: str = Query(..., description="Post slug to check like status for"),
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Check if current user has liked a post (requires authentication)"""
     token = credentials.credentials
     user_id = get_current_user_id(token)
 
     # Look up post ID from slug
-    post_id = get_post_id_by_slug(db, post_slug)
+    post_id = await get_post_id_by_slug(db, post_slug)
     if not post_id:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    liked = has_user_liked(db, user_id, post_id)
+    liked = await has_user_liked(db, user_id, post_id)
 
     return APIResponse(
         success=True,
@@ -149,3 +163,102 @@ async def check_like_status(
         message="Like status retrieved successfully",
         errors=None,
     )
+
+
+@router.post("/batch", response_model=APIResponse)
+async def get_likes_batch(
+    batch: LikeBatchRequest,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_db),
+):
+    """Like counts for many posts at once, plus the caller's status if signed in"""
+    if len(batch.post_slugs) + len(batch.post_ids) > settings.MAX_BATCH_POSTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.MAX_BATCH_POSTS} posts per request",
+        )
+
+    user_id = get_current_user_id(credentials.credentials) if credentials else None
+    summaries = await get_like_summaries(db, batch.post_slugs, batch.post_ids, user_id)
+
+    return APIResponse(
+        success=True,
+        data={"items": summaries},
+        message="Like summaries retrieved successfully",
+        errors=None,
+    )
+
+
+@router.get("/me", response_model=APIResponse)
+async def list_my_liked_posts(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor"),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+):
+    """Posts the current user liked, most recent first (requires authentication)"""
+    user_id = get_current_user_id(credentials.credentials)
+
+    try:
+        rows = await get_liked_posts(db, user_id, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    following = next_cursor(rows, limit)
+    return APIResponse(
+        success=True,
+        data={
+            "items": [
+                {
+                    "post_id": str(row.post_id),
+                    "post_slug": row.slug,
+                    "title": row.title,
+                    "summary": row.summary,
+                    "author_id": str(row.author_id),
+                    "published_at": (
+                        row.published_at.isoformat() if row.published_at else None
+                    ),
+                    "liked_at": row.created_at.isoformat(),
+                }
+                for row in rows
+            ],
+            "pagination": {
+                "limit": limit,
+                "cursor": cursor,
+                "next_cursor": following,
+                "has_next": following is not None,
+            },
+        },
+        message="Liked posts retrieved successfully",
+        errors=None,
+    )
+
+
+@router.get("/post/{post_slug}/likers/export")
+async def export_post_likers(
+    post_slug: str,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream everyone who liked a post as NDJSON (post author only)"""
+    user_id = get_current_user_id(credentials.credentials)
+
+    post_id = await get_post_id_by_slug(db, post_slug)
+    if not post_id:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if await get_post_author_id(db, post_id) != user_id:
+        raise HTTPException(
+            status_code=403, detail="Only the post author can export its likers"
+        )
+
+    async def ndjson():
+        async for rows in stream_post_likers(
+            post_id, settings.LIKERS_EXPORT_CHUNK_SIZE
+        ):
+            yield "".join(
+                json.dumps({"user_id": str(liker_id), "liked_at": liked_at.isoformat()})
+                + "\n"
+                for liker_id, liked_at in rows
+            )
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
 from uuid import UUID
-from typing import Optional
+from typing import List, Optional
 
 
 class LikeBase(BaseModel):
@@ -32,6 +32,13 @@ class LikeStatusResponse(BaseModel):
     liked: bool
 
 
+class LikeBatchRequest(BaseModel):
+    """Posts to summarize, by slug, by id, or a mix of both."""
+
+    post_slugs: List[str] = Field(default_factory=list)
+    post_ids: List[UUID] = Field(default_factory=list)
+
+
 class APIResponse(BaseModel):
     success: bool
     data: Optional[dict] = None
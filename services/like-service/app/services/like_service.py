@@ -1,59 +1,291 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import Like, Post
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import Like, Post, PostLikeCount
+from app.services.slug_cache import slug_cache
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+import base64
+import json
+import random
 import uuid
 
+settings = get_settings()
 
-def get_post_id_by_slug(db: Session, slug: str) -> uuid.UUID:
+# Advisory lock so only one worker reconciles like counters at a time
+STATS_RECONCILE_LOCK_ID = 0x6C696B6573
+
+
+async def get_post_id_by_slug(db: AsyncSession, slug: str) -> uuid.UUID:
     """Look up post ID by slug. Returns None if not found."""
-    post = db.query(Post).filter(Post.slug == slug).first()
-    if post:
-        return post.id
-    return None
+    found, post_id = slug_cache.get(slug)
+    if found:
+        return post_id
+
+    generation = slug_cache.generation
+    post_id = await db.scalar(select(Post.id).where(Post.slug == slug))
+    slug_cache.set(slug, post_id, generation)
+    return post_id
 
 
-def create_like(db: Session, user_id: uuid.UUID, post_id: uuid.UUID) -> Like:
+async def create_like(db: AsyncSession, user_id: uuid.UUID, post_id: uuid.UUID) -> Like:
     """Create a new like. Returns None if user already liked the post."""
-    # Check if like already exists
-    existing = (
-        db.query(Like).filter(Like.user_id == user_id, Like.post_id == post_id).first()
+    # A single statement, so concurrent double-likes cannot race each other
+    like = await db.scalar(
+        insert(Like)
+        .values(user_id=user_id, post_id=post_id)
+        .on_conflict_do_nothing(index_elements=["post_id", "user_id"])
+        .returning(Like)
     )
-    if existing:
-        return None
-
-    like = Like(user_id=user_id, post_id=post_id)
-    db.add(like)
-    db.commit()
-    db.refresh(like)
+    if like:
+        await _adjust_like_count(db, post_id, 1)
+    await db.commit()
     return like
 
 
-def delete_like(db: Session, user_id: uuid.UUID, post_id: uuid.UUID) -> bool:
+async def delete_like(db: AsyncSession, user_id: uuid.UUID, post_id: uuid.UUID) -> bool:
     """Delete a like (unlike). Returns True if deleted, False if not found."""
-    like = (
-        db.query(Like).filter(Like.user_id == user_id, Like.post_id == post_id).first()
+    deleted_id = await db.scalar(
+        delete(Like)
+        .where(Like.user_id == user_id, Like.post_id == post_id)
+        .returning(Like.id)
     )
-    if not like:
-        return False
+    if deleted_id:
+        await _adjust_like_count(db, post_id, -1)
+    await db.commit()
+    return deleted_id is not None
 
-    db.delete(like)
-    db.commit()
-    return True
 
+async def _adjust_like_count(db: AsyncSession, post_id: uuid.UUID, delta: int):
+    # Runs in the caller's transaction so the counter commits with the like
+    stmt = insert(PostLikeCount).values(
+        post_id=post_id,
+        shard=random.randrange(settings.LIKE_COUNTER_SHARDS),
+        like_count=delta,
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[PostLikeCount.post_id, PostLikeCount.shard],
+            set_={
+                "like_count": PostLikeCount.like_count + delta,
+                "updated_at": func.now(),
+            },
+        )
+    )
 
-def get_like_count(db: Session, post_id: uuid.UUID) -> int:
+
+async def get_like_count(db: AsyncSession, post_id: uuid.UUID) -> int:
     """Get total likes count for a post."""
-    return db.query(Like).filter(Like.post_id == post_id).count()
+    total = await db.scalar(
+        select(func.sum(PostLikeCount.like_count)).where(
+            PostLikeCount.post_id == post_id
+        )
+    )
+    return max(total or 0, 0)
+
+
+async def reconcile_like_counts(db: AsyncSession) -> int:
+    """
+    Recompute every post's counter from likes.likes and add the difference
+    to shard 0 of the ones that drifted. Returns the number of counters
+    repaired, or -1 if another worker is already reconciling.
+
+    A like commits its row and its counter change together, and both sides
+    are read in one statement, so likes in flight are missing from both.
+    Applying the correction as a delta keeps any that commit meanwhile.
+    """
+    locked = await db.scalar(
+        select(func.pg_try_advisory_xact_lock(STATS_RECONCILE_LOCK_ID))
+    )
+    if not locked:
+        await db.rollback()
+        return -1
+
+    actual = (
+        select(Like.post_id, func.count().label("like_count"))
+        .group_by(Like.post_id)
+        .subquery()
+    )
+    stored = (
+        select(
+            PostLikeCount.post_id,
+            func.sum(PostLikeCount.like_count).label("like_count"),
+        )
+        .group_by(PostLikeCount.post_id)
+        .subquery()
+    )
+    drift = func.coalesce(actual.c.like_count, 0) - func.coalesce(
+        stored.c.like_count, 0
+    )
+    drifted = (
+        await db.execute(
+            select(func.coalesce(actual.c.post_id, stored.c.post_id), drift)
+            .select_from(
+                actual.join(stored, actual.c.post_id == stored.c.post_id, full=True)
+            )
+            .where(drift != 0)
+        )
+    ).all()
+
+    if drifted:
+        stmt = insert(PostLikeCount)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[PostLikeCount.post_id, PostLikeCount.shard],
+                set_={
+                    "like_count": PostLikeCount.like_count + stmt.excluded.like_count,
+                    "updated_at": func.now(),
+                },
+            ),
+            [
+                {"post_id": post_id, "shard": 0, "like_count": delta}
+                for post_id, delta in drifted
+            ],
+        )
+    await db.commit()
+    return len(drifted)
 
 
-def has_user_liked(db: Session, user_id: uuid.UUID, post_id: uuid.UUID) -> bool:
+async def get_like_summaries(
+    db: AsyncSession,
+    post_slugs: List[str],
+    post_ids: List[uuid.UUID],
+    user_id: Optional[uuid.UUID] = None,
+) -> List[dict]:
+    """
+    Like count, and whether ``user_id`` liked it, for each existing post
+    matching the given slugs or ids. ``liked_by_me`` is None without a user.
+    """
+    posts = (
+        await db.execute(
+            select(Post.id, Post.slug).where(
+                or_(Post.slug.in_(post_slugs), Post.id.in_(post_ids))
+            )
+        )
+    ).all()
+    if not posts:
+        return []
+    found_ids = [post_id for post_id, _ in posts]
+
+    counts = dict(
+        (
+            await db.execute(
+                select(PostLikeCount.post_id, func.sum(PostLikeCount.like_count))
+                .where(PostLikeCount.post_id.in_(found_ids))
+                .group_by(PostLikeCount.post_id)
+            )
+        ).all()
+    )
+    liked = None
+    if user_id:
+        liked = set(
+            await db.scalars(
+                select(Like.post_id).where(
+                    Like.user_id == user_id, Like.post_id.in_(found_ids)
+                )
+            )
+        )
+
+    return [
+        {
+            "post_id": str(post_id),
+            "post_slug": slug,
+            "count": max(counts.get(post_id) or 0, 0),
+            "liked_by_me": post_id in liked if liked is not None else None,
+        }
+        for post_id, slug in posts
+    ]
+
+
+async def has_user_liked(
+    db: AsyncSession, user_id: uuid.UUID, post_id: uuid.UUID
+) -> bool:
     """Check if a user has liked a post."""
     return (
-        db.query(Like).filter(Like.user_id == user_id, Like.post_id == post_id).first()
+        await db.scalar(
+            select(Like.id).where(Like.user_id == user_id, Like.post_id == post_id)
+        )
         is not None
     )
 
 
-def get_user_likes_for_post(db: Session, post_id: uuid.UUID) -> list:
-    """Get all likes for a specific post."""
-    return db.query(Like).filter(Like.post_id == post_id).all()
+def encode_cursor(created_at: datetime, like_id: uuid.UUID) -> str:
+    """Build an opaque pagination cursor pointing just past the given like."""
+    raw = json.dumps([created_at.isoformat(), str(like_id)])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor into (created_at, like_id). Raises ValueError if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        created_at, like_id = json.loads(raw)
+        if not isinstance(created_at, str) or not isinstance(like_id, str):
+            raise ValueError("Invalid cursor")
+        return datetime.fromisoformat(created_at), uuid.UUID(like_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+async def get_liked_posts(
+    db: AsyncSession, user_id: uuid.UUID, limit: int, cursor: Optional[str] = None
+) -> list:
+    """
+    A page of the posts ``user_id`` liked, most recent like first, with only
+    the post columns a card needs. Raises ValueError for a bad cursor.
+    """
+    query = (
+        select(
+            Like.id,
+            Like.created_at,
+            Post.id.label("post_id"),
+            Post.slug,
+            Post.title,
+            Post.summary,
+            Post.author_id,
+            Post.published_at,
+        )
+        .join(Post, Post.id == Like.post_id)
+        .where(Like.user_id == user_id)
+    )
+    if cursor:
+        created_at, like_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(Like.created_at, Like.id) < tuple_(created_at, like_id)
+        )
+    query = query.order_by(Like.created_at.desc(), Like.id.desc()).limit(limit)
+    return (await db.execute(query)).all()
+
+
+def next_cursor(rows: list, limit: int) -> Optional[str]:
+    """Cursor for the page after ``rows``, or None if this was the last page."""
+    if len(rows) < limit:
+        return None
+    return encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+async def get_post_author_id(
+    db: AsyncSession, post_id: uuid.UUID
+) -> Optional[uuid.UUID]:
+    return await db.scalar(select(Post.author_id).where(Post.id == post_id))
+
+
+async def stream_post_likers(
+    post_id: uuid.UUID, chunk_size: int
+) -> AsyncIterator[list]:
+    """
+    Yield a post's likers as lists of (user_id, created_at) rows, oldest
+    first, read through a server-side cursor ``chunk_size`` rows at a time.
+    Uses its own session so it can outlive the request handler.
+    """
+    async with SessionLocal() as db:
+        result = await db.stream(
+            select(Like.user_id, Like.created_at)
+            .where(Like.post_id == post_id)
+            .order_by(Like.created_at, Like.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions():
+            yield rows
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+from sqlalchemy import func, select
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import PostEvent
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class SlugCache:
+    """
+    Bounded LRU of slug -> post id with per-entry expiry.
+
+    Unknown slugs are stored as None under a shorter TTL, so repeated
+    lookups of a bad slug don't each hit the database. Entries are evicted
+    early when the post service records a slug change in posts.post_events.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, negative_ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Optional[uuid.UUID]]]" = (
+            OrderedDict()
+        )
+        # Bumped on every invalidation so a lookup that raced one isn't stored
+        self.generation = 0
+        self._last_event_id: Optional[int] = None
+
+    def get(self, slug: str) -> Tuple[bool, Optional[uuid.UUID]]:
+        """Return (found, post id); a found None means the slug is known missing."""
+        entry = self._entries.get(slug)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[slug]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(slug)
+        self.hits += 1
+        return True, entry[1]
+
+    def set(self, slug: str, post_id: Optional[uuid.UUID], generation: int) -> None:
+        if generation != self.generation:
+            return
+        ttl = self.ttl if post_id is not None else self.negative_ttl
+        self._entries[slug] = (time.monotonic() + ttl, post_id)
+        self._entries.move_to_end(slug)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *slugs: str) -> None:
+        self.generation += 1
+        for slug in slugs:
+            self._entries.pop(slug, None)
+
+    async def poll_events(self) -> int:
+        """
+        Evict slugs named by outbox events since the last poll. An event whose
+        transaction commits after a later id was read is missed; the TTL
+        bounds how long that leaves a stale entry. The post service deletes
+        events after POST_EVENTS_RETENTION_SECONDS, which must exceed the
+        TTL so a pruned event can only concern entries that expired.
+        """
+        async with SessionLocal() as db:
+            if self._last_event_id is None:
+                # Nothing is cached yet, so only later events matter
+                self._last_event_id = await db.scalar(
+                    select(func.coalesce(func.max(PostEvent.id), 0))
+                )
+                return 0
+            events = (
+                await db.execute(
+                    select(PostEvent.id, PostEvent.slug)
+                    .where(PostEvent.id > self._last_event_id)
+                    .order_by(PostEvent.id)
+                )
+            ).all()
+        if events:
+            self.invalidate(*(slug for _, slug in events))
+            self._last_event_id = events[-1][0]
+        return len(events)
+
+    def metrics(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+async def run_slug_invalidator(interval: float):
+    """Periodically evict cached slugs the post service changed or deleted."""
+    while True:
+        try:
+            await slug_cache.poll_events()
+        except Exception as e:
+            logger.error(f"Error polling post events: {e}")
+        await asyncio.sleep(interval)
+
+
+slug_cache = SlugCache(
+    settings.SLUG_CACHE_MAX_ENTRIES,
+    settings.SLUG_CACHE_TTL_SECONDS,
+    settings.SLUG_CACHE_NEGATIVE_TTL_SECONDS,
+)
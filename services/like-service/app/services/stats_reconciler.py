@@ -0,0 +1,19 @@
+import asyncio
+import logging
+from app.database import SessionLocal
+from app.services.like_service import reconcile_like_counts
+
+logger = logging.getLogger(__name__)
+
+
+async def run_stats_reconciler(interval: float):
+    """Periodically repair drift in likes.post_like_counts."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with SessionLocal() as db:
+                repaired = await reconcile_like_counts(db)
+            if repaired > 0:
+                logger.warning(f"Repaired {repaired} drifted post like counters")
+        except Exception as e:
+            logger.error(f"Error reconciling like counters: {e}")
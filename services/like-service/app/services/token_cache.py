@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+import httpx
+from jose import JWTError, jwk, jwt
+from app.config import get_settings
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSKeys:
+    """
+    Public keys from auth-service's JWKS, by ``kid``, for verifying ES256
+    tokens locally. Refreshed in the background, never per request; a token
+    with an unknown kid only wakes the refresher early.
+    """
+
+    def __init__(self, url: str, algorithm: str):
+        self.url = url
+        self.algorithm = algorithm
+        self.keys = {}
+        self.refreshes = 0
+        self.last_refresh: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def key_for(self, token: str):
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.keys.get(kid)
+        if key is None:
+            if self._loop is not None:
+                # May be called from a threadpool worker (sync dependencies)
+                self._loop.call_soon_threadsafe(self._wake.set)
+            raise JWTError("Unknown signing key")
+        return key
+
+    async def refresh(self) -> None:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+        keys = {}
+        for entry in response.json().get("keys", []):
+            if entry.get("kid") and entry.get("alg", self.algorithm) == self.algorithm:
+                keys[entry["kid"]] = jwk.construct(entry, self.algorithm)
+        self.keys = keys
+        self.refreshes += 1
+        self.last_refresh = time.monotonic()
+
+    async def run(self, interval: float, min_interval: float):
+        """Fetch the key set now, then every ``interval`` or when woken."""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        while True:
+            failed = False
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Error fetching JWKS from {self.url}: {e}")
+                failed = True
+            await asyncio.sleep(min_interval)
+            if not failed:
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), timeout=max(interval - min_interval, 0)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified access tokens and their claims.
+
+    Only tokens that passed signature verification are stored, and an entry
+    expires at the token's own ``exp``, so a hit is as valid as a fresh decode.
+    Tokens without ``exp`` are verified every time.
+    """
+
+    def __init__(self, max_entries: int, jwks: Optional[JWKSKeys] = None):
+        self.max_entries = max_entries
+        self.jwks = jwks
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def decode(self, token: str) -> dict:
+        """Verified claims of ``token``. Raises JWTError just like jwt.decode."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._entries.move_to_end(token)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[token]
+            self.misses += 1
+
+        key = self.jwks.key_for(token) if self.jwks else settings.JWT_SECRET_KEY
+        claims = jwt.decode(token, key, algorithms=[settings.JWT_ALGORITHM])
+        expires_at = claims.get("exp")
+        if isinstance(expires_at, (int, float)):
+            with self._lock:
+                self._entries[token] = (expires_at, claims)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return claims
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        metrics = {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        if self.jwks:
+            metrics["jwks_keys"] = len(self.jwks.keys)
+            metrics["jwks_refreshes"] = self.jwks.refreshes
+        return metrics
+
+
+async def run_jwks_refresher():
+    """Keep the JWKS key set current; a no-op with a shared HMAC secret."""
+    if token_cache.jwks:
+        await token_cache.jwks.run(
+            settings.JWKS_REFRESH_INTERVAL_SECONDS, settings.JWKS_MIN_REFRESH_SECONDS
+        )
+
+
+token_cache = TokenCache(
+    settings.JWT_CACHE_MAX_ENTRIES,
+    (
+        None
+        if settings.JWT_ALGORITHM.startswith("HS")
+        else JWKSKeys(
+            f"{settings.AUTH_SERVICE_URL}/.well-known/jwks.json",
+            settings.JWT_ALGORITHM,
+        )
+    ),
+)
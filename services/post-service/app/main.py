@@ -1,13 +1,20 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import posts
-from app.database import Base, engine
+from app.database import Base, engine, pool_metrics
+from app.services.token_cache import token_cache, run_jwks_refresher
+from app.services.view_counter import view_counter
+from app.services.post_cache import post_cache
+from app.services.event_pruner import run_event_pruner
+from app.config import get_settings
+import asyncio
 import logging
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 app = FastAPI(
     title="Blogin Post Service",
@@ -29,15 +36,33 @@ app.add_middleware(
 async def startup_event():
     logger.info("Starting up Post Service...")
     try:
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created/verified")
     except Exception as e:
         logger.error(f"Error creating tables: {e}")
 
+    app.state.view_flusher = asyncio.create_task(view_counter.run())
+    app.state.jwks_refresher = asyncio.create_task(run_jwks_refresher())
+    app.state.event_pruner = asyncio.create_task(
+        run_event_pruner(
+            settings.POST_EVENTS_PRUNE_INTERVAL_SECONDS,
+            settings.POST_EVENTS_RETENTION_SECONDS,
+        )
+    )
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Post Service...")
+    app.state.jwks_refresher.cancel()
+    app.state.event_pruner.cancel()
+    # Let an in-progress flush finish, then write out anything recorded since
+    view_counter.stop()
+    await app.state.view_flusher
+    await view_counter.flush()
+    await post_cache.close()
+    await engine.dispose()
 
 
 @app.get("/health")
@@ -45,6 +70,16 @@ async def health_check():
     return {"status": "healthy", "service": "post-service"}
 
 
+@app.get("/metrics/pool")
+async def get_pool_metrics():
+    return {"service": "post-service", **pool_metrics()}
+
+
+@app.get("/metrics/auth")
+async def get_auth_metrics():
+    return {"service": "post-service", **token_cache.metrics()}
+
+
 app.include_router(posts.router, prefix="/posts")
 
 if __name__ == "__main__":
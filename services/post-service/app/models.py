@@ -1,7 +1,17 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Table, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    String,
+    Integer,
+    DateTime,
+    ForeignKey,
+    Index,
+    Table,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.database import Base
 import uuid
 
@@ -42,10 +52,29 @@ class Post(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
     published_at = Column(DateTime(timezone=True), nullable=True)
+    # Weighted title/summary/content vector, maintained by the post service
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
 
     tags = relationship("Tag", secondary=post_tags, back_populates="posts")
 
 
+# Composite indexes backing keyset pagination, which orders by (created_at, id)
+Index(
+    "idx_posts_status_created_at_id",
+    Post.status,
+    Post.created_at.desc(),
+    Post.id.desc(),
+)
+Index(
+    "idx_posts_author_status_created_at_id",
+    Post.author_id,
+    Post.status,
+    Post.created_at.desc(),
+    Post.id.desc(),
+)
+Index("idx_posts_search_vector", Post.search_vector, postgresql_using="gin")
+
+
 class Tag(Base):
     __tablename__ = "tags"
     __table_args__ = {"schema": "posts"}
@@ -56,3 +85,21 @@ class Tag(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     posts = relationship("Post", secondary=post_tags, back_populates="tags")
+
+
+class PostEvent(Base):
+    """
+    Outbox of slugs that started or stopped resolving to a post, written in
+    the same transaction as the change, so services caching slug lookups
+    know what to drop.
+    """
+
+    __tablename__ = "post_events"
+    __table_args__ = {"schema": "posts"}
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    post_id = Column(UUID(as_uuid=True), nullable=False)
+    # The slug that stopped (or, for post.created, started) resolving
+    slug = Column(String(255), nullable=False)
+    event_type = Column(String(50), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
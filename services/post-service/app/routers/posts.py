@@ -1,13 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from jose import jwt, JWTError
+from jose import JWTError
 import uuid
 
 from app.database import get_db
 from app.schemas import PostCreate, PostUpdate, PostResponse, APIResponse
-from app.models import Post
+from app.models import Post, PostEvent
 from app.services.post_service import (
     get_post_by_id,
     get_post_by_slug,
@@ -15,11 +15,15 @@ from app.services.post_service import (
     update_post,
     delete_post,
     list_posts,
-    increment_view_count,
     get_all_tags,
     get_posts_by_author,
+    next_cursor,
+    is_ranked_search,
 )
+from app.services.view_counter import view_counter
+from app.services.post_cache import post_cache
 from app.config import get_settings
+from app.services.token_cache import token_cache
 
 router = APIRouter(tags=["Posts"])
 security = HTTPBearer()
@@ -28,9 +32,7 @@ settings = get_settings()
 
 def get_current_user_id(token: str) -> uuid.UUID:
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = token_cache.decode(token)
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -43,6 +45,41 @@ def get_current_user_id(token: str) -> uuid.UUID:
         )
 
 
+def build_pagination(
+    results: list,
+    total: int,
+    total_is_exact: bool,
+    page: int,
+    limit: int,
+    cursor: Optional[str],
+    keyset: bool = True,
+) -> dict:
+    # Relevance-ordered pages can't be resumed from a (created_at, id) cursor
+    following = next_cursor(results, limit) if keyset else None
+    if cursor:
+        # Keyset mode: page numbers are meaningless, callers follow next_cursor
+        return {
+            "total": total,
+            "total_is_exact": total_is_exact,
+            "limit": limit,
+            "cursor": cursor,
+            "next_cursor": following,
+            "has_next": following is not None,
+        }
+
+    total_pages = (total + limit - 1) // limit
+    return {
+        "total": total,
+        "total_is_exact": total_is_exact,
+        "page": page,
+        "limit": limit,
+        "total_pages": total_pages,
+        "has_next": page < total_pages,
+        "has_prev": page > 1,
+        "next_cursor": following if page < total_pages else None,
+    }
+
+
 @router.get("/", response_model=APIResponse)
 async def list_all_posts(
     page: int = Query(1, ge=1),
@@ -51,21 +88,25 @@ async def list_all_posts(
     author_id: Optional[str] = Query(None),
     tag: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor"),
+    db: AsyncSession = Depends(get_db),
 ):
     skip = (page - 1) * limit
     author_uuid = uuid.UUID(author_id) if author_id else None
 
-    results, total = list_posts(
-        db,
-        status=status,
-        author_id=author_uuid,
-        tag=tag,
-        search=search,
-        skip=skip,
-        limit=limit,
-    )
-    total_pages = (total + limit - 1) // limit
+    try:
+        results, total, total_is_exact = await list_posts(
+            db,
+            status=status,
+            author_id=author_uuid,
+            tag=tag,
+            search=search,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return APIResponse(
         success=True,
@@ -89,17 +130,19 @@ async def list_all_posts(
                     "published_at": post.published_at.isoformat()
                     if post.published_at
                     else None,
+                    "search_snippet": snippet,
                 }
-                for post, username, avatar_url in results
+                for post, username, avatar_url, snippet in results
             ],
-            "pagination": {
-                "total": total,
-                "page": page,
-                "limit": limit,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1,
-            },
+            "pagination": build_pagination(
+                results,
+                total,
+                total_is_exact,
+                page,
+                limit,
+                cursor,
+                keyset=not is_ranked_search(search),
+            ),
         },
         message="Posts retrieved successfully",
         errors=None,
@@ -107,27 +150,35 @@ async def list_all_posts(
 
 
 @router.get("/{slug}/", response_model=APIResponse)
-async def get_post(slug: str, db: Session = Depends(get_db)):
-    post = get_post_by_slug(db, slug)
+async def get_post(slug: str, db: AsyncSession = Depends(get_db)):
+    cached = await post_cache.get(slug)
+    if cached:
+        post_id, body = cached
+        view_counter.record(post_id)
+        return Response(content=body, media_type="application/json")
+
+    post = await get_post_by_slug(db, slug)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    # Increment view count
-    increment_view_count(db, post.id)
+    # Buffered; flushed to the database in bulk by the view counter task
+    view_counter.record(post.id)
 
     # Get author info
     from sqlalchemy import text
 
-    result = db.execute(
-        text(
-            "SELECT username, avatar_url FROM users.profiles WHERE user_id = :user_id"
-        ),
-        {"user_id": str(post.author_id)},
+    result = (
+        await db.execute(
+            text(
+                "SELECT username, avatar_url FROM users.profiles WHERE user_id = :user_id"
+            ),
+            {"user_id": post.author_id},
+        )
     ).fetchone()
     author_username = result[0] if result else None
     author_avatar = result[1] if result else None
 
-    return APIResponse(
+    response = APIResponse(
         success=True,
         data={
             "id": str(post.id),
@@ -139,7 +190,9 @@ async def get_post(slug: str, db: Session = Depends(get_db)):
             "content": post.content,
             "summary": post.summary,
             "status": post.status,
-            "view_count": post.view_count + 1,  # Already incremented
+            # Views written so far; buffered ones, including this, land with
+            # the next flush, and cached copies show them once they expire
+            "view_count": post.view_count,
             "tags": [
                 {"id": str(t.id), "name": t.name, "slug": t.slug} for t in post.tags
             ],
@@ -152,18 +205,21 @@ async def get_post(slug: str, db: Session = Depends(get_db)):
         message="Post retrieved successfully",
         errors=None,
     )
+    body = response.model_dump_json().encode("utf-8")
+    await post_cache.set(slug, post.id, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/", response_model=APIResponse)
 async def create_new_post(
     post_data: PostCreate,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     token = credentials.credentials
     user_id = get_current_user_id(token)
 
-    post = create_post(db, user_id, post_data)
+    post = await create_post(db, user_id, post_data)
 
     return APIResponse(
         success=True,
@@ -184,7 +240,7 @@ async def update_existing_post(
     post_identifier: str,
     post_data: PostUpdate,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     token = credentials.credentials
     user_id = get_current_user_id(token)
@@ -192,13 +248,13 @@ async def update_existing_post(
     # Try to get post by UUID first, then by slug
     post = None
     try:
-        post = get_post_by_id(db, uuid.UUID(post_identifier))
+        post = await get_post_by_id(db, uuid.UUID(post_identifier))
     except ValueError:
         # Not a valid UUID, try slug instead
         pass
 
     if not post:
-        post = get_post_by_slug(db, post_identifier)
+        post = await get_post_by_slug(db, post_identifier)
 
     if not post:
         raise HTTPException(
@@ -214,11 +270,13 @@ async def update_existing_post(
     # Update the post
     from app.services.post_service import update_post as service_update_post
 
-    updated_post = service_update_post(db, post.id, user_id, post_data)
+    old_slug = post.slug
+    updated_post = await service_update_post(db, post.id, user_id, post_data)
     if not updated_post:
         raise HTTPException(
             status_code=404, detail="Post not found or you don't have permission"
         )
+    await post_cache.invalidate(old_slug, updated_post.slug)
 
     return APIResponse(
         success=True,
@@ -238,7 +296,7 @@ async def update_existing_post(
 async def delete_existing_post(
     post_identifier: str,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     token = credentials.credentials
     user_id = get_current_user_id(token)
@@ -246,13 +304,13 @@ async def delete_existing_post(
     # Try to get post by UUID first, then by slug
     post = None
     try:
-        post = get_post_by_id(db, uuid.UUID(post_identifier))
+        post = await get_post_by_id(db, uuid.UUID(post_identifier))
     except ValueError:
         # Not a valid UUID, try slug instead
         pass
 
     if not post:
-        post = get_post_by_slug(db, post_identifier)
+        post = await get_post_by_slug(db, post_identifier)
 
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
@@ -264,8 +322,11 @@ async def delete_existing_post(
         )
 
     # Delete the post
-    db.delete(post)
-    db.commit()
+    slug = post.slug
+    await db.delete(post)
+    db.add(PostEvent(post_id=post.id, slug=slug, event_type="post.deleted"))
+    await db.commit()
+    await post_cache.invalidate(slug)
 
     return APIResponse(
         success=True, data=None, message="Post deleted successfully", errors=None
@@ -273,8 +334,8 @@ async def delete_existing_post(
 
 
 @router.get("/tags", response_model=APIResponse)
-async def list_tags(db: Session = Depends(get_db)):
-    tags = get_all_tags(db)
+async def list_tags(db: AsyncSession = Depends(get_db)):
+    tags = await get_all_tags(db)
 
     return APIResponse(
         success=True,
@@ -291,13 +352,16 @@ async def get_posts_by_author_id(
     author_id: str,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor"),
+    db: AsyncSession = Depends(get_db),
 ):
     skip = (page - 1) * limit
-    results, total = get_posts_by_author(
-        db, uuid.UUID(author_id), skip=skip, limit=limit
-    )
-    total_pages = (total + limit - 1) // limit
+    try:
+        results, total, total_is_exact = await get_posts_by_author(
+            db, uuid.UUID(author_id), skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return APIResponse(
         success=True,
@@ -324,14 +388,9 @@ async def get_posts_by_author_id(
                 }
                 for post, username, avatar_url in results
             ],
-            "pagination": {
-                "total": total,
-                "page": page,
-                "limit": limit,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1,
-            },
+            "pagination": build_pagination(
+                results, total, total_is_exact, page, limit, cursor
+            ),
         },
         message="Author posts retrieved successfully",
         errors=None,
@@ -0,0 +1,49 @@
+import asyncio
+import logging
+from datetime import timedelta
+from sqlalchemy import delete, func, select
+from app.database import SessionLocal
+from app.models import PostEvent
+
+logger = logging.getLogger(__name__)
+
+# Rows deleted per transaction
+PRUNE_BATCH_SIZE = 1000
+
+
+async def prune_post_events(retention: float) -> int:
+    """
+    Delete post events older than ``retention`` seconds. Consumers track
+    their position in memory, so events are kept by age rather than by
+    offset; once older than a consumer's cache TTL, anything cached before
+    the event has expired anyway.
+    """
+    pruned = 0
+    while True:
+        async with SessionLocal() as db:
+            expired = (
+                select(PostEvent.id)
+                .where(PostEvent.created_at < func.now() - timedelta(seconds=retention))
+                .order_by(PostEvent.id)
+                .limit(PRUNE_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(
+                delete(PostEvent).where(PostEvent.id.in_(expired.scalar_subquery()))
+            )
+            await db.commit()
+        pruned += result.rowcount
+        if result.rowcount < PRUNE_BATCH_SIZE:
+            return pruned
+
+
+async def run_event_pruner(interval: float, retention: float):
+    """Periodically delete post events every consumer is done with."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            pruned = await prune_post_events(retention)
+            if pruned:
+                logger.info(f"Pruned {pruned} post events")
+        except Exception as e:
+            logger.error(f"Error pruning post events: {e}")
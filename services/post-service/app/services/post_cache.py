@@ -0,0 +1,108 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional, Protocol, Tuple
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class CacheBackend(Protocol):
+    """The subset of the redis.asyncio client API the post cache relies on."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None) -> Any:
+        ...
+
+    async def delete(self, *keys: str) -> int:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class LRUCacheBackend:
+    """Thread-safe in-process LRU with per-key expiry.
+
+    Never blocks; the methods are coroutines only to match the Redis client.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + ex if ex is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._entries.pop(key, None) is not None for key in keys)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class PostDetailCache:
+    """Read-through cache of serialized post detail responses, keyed by slug.
+
+    Values are the post id (16 raw bytes) followed by the JSON body, so a
+    cache hit can still record a view without decoding the body.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(slug: str) -> str:
+        return f"post-detail:{slug}"
+
+    async def get(self, slug: str) -> Optional[Tuple[uuid.UUID, bytes]]:
+        value = await self.backend.get(self._key(slug))
+        if value is None:
+            return None
+        return uuid.UUID(bytes=value[:16]), value[16:]
+
+    async def set(self, slug: str, post_id: uuid.UUID, body: bytes) -> None:
+        await self.backend.set(self._key(slug), post_id.bytes + body, ex=self.ttl)
+
+    async def invalidate(self, *slugs: str) -> None:
+        await self.backend.delete(*(self._key(slug) for slug in slugs))
+
+    async def close(self) -> None:
+        await self.backend.aclose()
+
+
+def create_backend() -> CacheBackend:
+    if settings.POST_CACHE_REDIS_URL:
+        # Optional dependency (redis>=5), only needed when a shared cache is
+        # configured; the asyncio client keeps round trips off the event loop
+        import redis.asyncio
+
+        return redis.asyncio.Redis.from_url(settings.POST_CACHE_REDIS_URL)
+    return LRUCacheBackend(settings.POST_CACHE_MAX_ENTRIES)
+
+
+post_cache = PostDetailCache(create_backend(), settings.POST_CACHE_TTL_SECONDS)
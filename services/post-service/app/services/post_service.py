@@ -1,14 +1,26 @@
 from typing import Optional, List
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc, Table, Column, String
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import func, desc, literal, select, tuple_, Table, Column, String
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from slugify import slugify
-from app.models import Post, Tag
+from app.models import Post, PostEvent, Tag
 from app.database import Base
 from app.schemas import PostCreate, PostUpdate
+from app.services.count_service import count_rows
+from app.services.search_service import (
+    build_search_vector,
+    apply_full_text_search,
+    apply_legacy_search,
+)
+from app.config import get_settings
+import base64
+import json
 import uuid
 from datetime import datetime
 
+settings = get_settings()
+
 # Reference to users.profiles table for cross-schema queries
 users_profiles = Table(
     "profiles",
@@ -20,31 +32,82 @@ users_profiles = Table(
 )
 
 
-def get_post_by_id(db: Session, post_id: uuid.UUID) -> Optional[Post]:
-    return (
-        db.query(Post).options(joinedload(Post.tags)).filter(Post.id == post_id).first()
+def encode_cursor(created_at: datetime, post_id: uuid.UUID) -> str:
+    """Build an opaque pagination cursor pointing just past the given post."""
+    raw = json.dumps([created_at.isoformat(), str(post_id)])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor into (created_at, post_id). Raises ValueError if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        created_at, post_id = json.loads(raw)
+        if not isinstance(created_at, str) or not isinstance(post_id, str):
+            raise ValueError("Invalid cursor")
+        return datetime.fromisoformat(created_at), uuid.UUID(post_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def is_ranked_search(search: Optional[str]) -> bool:
+    """Whether list_posts orders by relevance, which keyset cursors can't follow."""
+    return bool(search) and settings.SEARCH_FULL_TEXT_ENABLED
+
+
+def next_cursor(results: list, limit: int) -> Optional[str]:
+    """Cursor for the page after ``results``, or None if this was the last page."""
+    if len(results) < limit:
+        return None
+    last_post = results[-1][0]
+    return encode_cursor(last_post.created_at, last_post.id)
+
+
+async def _paginate(
+    db: AsyncSession, query, skip: int, limit: int, cursor: Optional[str], rank=None
+):
+    if cursor:
+        if rank is not None:
+            raise ValueError("Cursors are not supported for search; use page")
+        # Keyset seek only works against the (created_at, id) ordering
+        created_at, post_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(Post.created_at, Post.id) < tuple_(created_at, post_id)
+        ).order_by(desc(Post.created_at), desc(Post.id))
+        return (await db.execute(query.limit(limit))).all()
+    if rank is not None:
+        query = query.order_by(desc(rank))
+    query = query.order_by(desc(Post.created_at), desc(Post.id))
+    return (await db.execute(query.offset(skip).limit(limit))).all()
+
+
+async def get_post_by_id(db: AsyncSession, post_id: uuid.UUID) -> Optional[Post]:
+    result = await db.execute(
+        select(Post).options(joinedload(Post.tags)).where(Post.id == post_id)
     )
+    return result.unique().scalars().first()
 
 
-def get_post_by_slug(db: Session, slug: str) -> Optional[Post]:
-    return (
-        db.query(Post).options(joinedload(Post.tags)).filter(Post.slug == slug).first()
+async def get_post_by_slug(db: AsyncSession, slug: str) -> Optional[Post]:
+    result = await db.execute(
+        select(Post).options(joinedload(Post.tags)).where(Post.slug == slug)
     )
+    return result.unique().scalars().first()
 
 
-def generate_unique_slug(
-    db: Session, title: str, exclude_post_id: Optional[uuid.UUID] = None
+async def generate_unique_slug(
+    db: AsyncSession, title: str, exclude_post_id: Optional[uuid.UUID] = None
 ) -> str:
     base_slug = slugify(title, max_length=50)
     slug = base_slug
     counter = 1
 
     while True:
-        query = db.query(Post).filter(Post.slug == slug)
+        query = select(Post.id).where(Post.slug == slug)
         if exclude_post_id:
-            query = query.filter(Post.id != exclude_post_id)
+            query = query.where(Post.id != exclude_post_id)
 
-        if not query.first():
+        if not (await db.execute(query)).first():
             break
 
         slug = f"{base_slug}-{counter}"
@@ -53,23 +116,27 @@ def generate_unique_slug(
     return slug
 
 
-def get_or_create_tags(db: Session, tag_names: List[str]) -> List[Tag]:
+async def get_or_create_tags(db: AsyncSession, tag_names: List[str]) -> List[Tag]:
     tags = []
     for name in tag_names:
         tag_slug = slugify(name, max_length=50)
-        tag = db.query(Tag).filter(func.lower(Tag.name) == func.lower(name)).first()
+        tag = await db.scalar(
+            select(Tag).where(func.lower(Tag.name) == func.lower(name))
+        )
         if not tag:
             tag = Tag(name=name, slug=tag_slug)
             db.add(tag)
-            db.commit()
-            db.refresh(tag)
+            await db.commit()
+            await db.refresh(tag)
         tags.append(tag)
     return tags
 
 
-def create_post(db: Session, author_id: uuid.UUID, post_data: PostCreate) -> Post:
-    slug = generate_unique_slug(db, post_data.title)
-    tags = get_or_create_tags(db, post_data.tags or [])
+async def create_post(
+    db: AsyncSession, author_id: uuid.UUID, post_data: PostCreate
+) -> Post:
+    slug = await generate_unique_slug(db, post_data.title)
+    tags = await get_or_create_tags(db, post_data.tags or [])
 
     published_at = None
     if post_data.status == "published":
@@ -84,18 +151,23 @@ def create_post(db: Session, author_id: uuid.UUID, post_data: PostCreate) -> Pos
         status=post_data.status,
         published_at=published_at,
         tags=tags,
+        search_vector=build_search_vector(
+            post_data.title, post_data.summary, post_data.content
+        ),
     )
 
     db.add(post)
-    db.commit()
-    db.refresh(post)
+    await db.flush()
+    db.add(PostEvent(post_id=post.id, slug=slug, event_type="post.created"))
+    await db.commit()
+    await db.refresh(post)
     return post
 
 
-def update_post(
-    db: Session, post_id: uuid.UUID, author_id: uuid.UUID, post_data: PostUpdate
+async def update_post(
+    db: AsyncSession, post_id: uuid.UUID, author_id: uuid.UUID, post_data: PostUpdate
 ) -> Optional[Post]:
-    post = get_post_by_id(db, post_id)
+    post = await get_post_by_id(db, post_id)
     if not post or post.author_id != author_id:
         return None
 
@@ -103,12 +175,15 @@ def update_post(
 
     # Handle tags separately
     if "tags" in update_data:
-        tags = get_or_create_tags(db, update_data.pop("tags") or [])
+        tags = await get_or_create_tags(db, update_data.pop("tags") or [])
         post.tags = tags
 
     # Generate new slug if title changed
     if "title" in update_data and update_data["title"] != post.title:
-        update_data["slug"] = generate_unique_slug(db, update_data["title"], post_id)
+        update_data["slug"] = await generate_unique_slug(
+            db, update_data["title"], post_id
+        )
+        db.add(PostEvent(post_id=post_id, slug=post.slug, event_type="post.renamed"))
 
     # Handle publish date
     if "status" in update_data:
@@ -120,87 +195,96 @@ def update_post(
     for field, value in update_data.items():
         setattr(post, field, value)
 
-    db.commit()
-    db.refresh(post)
+    if {"title", "summary", "content"} & update_data.keys():
+        post.search_vector = build_search_vector(post.title, post.summary, post.content)
+
+    await db.commit()
+    await db.refresh(post)
     return post
 
 
-def delete_post(db: Session, post_id: uuid.UUID, author_id: uuid.UUID) -> bool:
-    post = get_post_by_id(db, post_id)
+async def delete_post(
+    db: AsyncSession, post_id: uuid.UUID, author_id: uuid.UUID
+) -> bool:
+    post = await get_post_by_id(db, post_id)
     if not post or post.author_id != author_id:
         return False
 
-    db.delete(post)
-    db.commit()
+    await db.delete(post)
+    db.add(PostEvent(post_id=post_id, slug=post.slug, event_type="post.deleted"))
+    await db.commit()
     return True
 
 
-def list_posts(
-    db: Session,
+async def list_posts(
+    db: AsyncSession,
     status: Optional[str] = None,
     author_id: Optional[uuid.UUID] = None,
     tag: Optional[str] = None,
     search: Optional[str] = None,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
 ) -> tuple:
     # Join with users.profiles to get username and avatar
-    query = db.query(
-        Post,
-        users_profiles.c.username.label("author_username"),
-        users_profiles.c.avatar_url.label("author_avatar"),
-    ).outerjoin(users_profiles, Post.author_id == users_profiles.c.user_id)
+    # Tags for the whole page are loaded in one extra SELECT ... WHERE post_id IN
+    query = (
+        select(
+            Post,
+            users_profiles.c.username.label("author_username"),
+            users_profiles.c.avatar_url.label("author_avatar"),
+        )
+        .outerjoin(users_profiles, Post.author_id == users_profiles.c.user_id)
+        .options(selectinload(Post.tags))
+    )
 
     if status:
-        query = query.filter(Post.status == status)
+        query = query.where(Post.status == status)
     else:
-        query = query.filter(Post.status == "published")
+        query = query.where(Post.status == "published")
 
     if author_id:
-        query = query.filter(Post.author_id == author_id)
+        query = query.where(Post.author_id == author_id)
 
     if tag:
-        query = query.join(Post.tags).filter(func.lower(Tag.name) == func.lower(tag))
+        query = query.join(Post.tags).where(func.lower(Tag.name) == func.lower(tag))
 
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
-            (Post.title.ilike(search_pattern)) | (Post.content.ilike(search_pattern))
-        )
+    rank = None
+    snippet = literal(None)
+    if is_ranked_search(search):
+        query, rank, snippet = apply_full_text_search(query, search)
+    elif search:
+        query = apply_legacy_search(query, search)
 
-    total = query.count()
-    results = query.order_by(desc(Post.created_at)).offset(skip).limit(limit).all()
+    total, total_is_exact = await count_rows(db, query)
+    query = query.add_columns(snippet.label("search_snippet"))
+    results = await _paginate(db, query, skip, limit, cursor, rank=rank)
 
-    # Return list of tuples (post, username)
-    return results, total
+    # Return list of tuples (post, username, avatar, snippet)
+    return results, total, total_is_exact
 
 
-def increment_view_count(db: Session, post_id: uuid.UUID) -> bool:
-    post = get_post_by_id(db, post_id)
-    if not post:
-        return False
+async def get_all_tags(db: AsyncSession) -> List[Tag]:
+    return (await db.scalars(select(Tag).order_by(Tag.name))).all()
 
-    post.view_count += 1
-    db.commit()
-    return True
-
-
-def get_all_tags(db: Session) -> List[Tag]:
-    return db.query(Tag).order_by(Tag.name).all()
 
-
-def get_posts_by_author(
-    db: Session, author_id: uuid.UUID, skip: int = 0, limit: int = 20
+async def get_posts_by_author(
+    db: AsyncSession,
+    author_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
 ) -> tuple:
     query = (
-        db.query(
+        select(
             Post,
             users_profiles.c.username.label("author_username"),
             users_profiles.c.avatar_url.label("author_avatar"),
         )
         .outerjoin(users_profiles, Post.author_id == users_profiles.c.user_id)
-        .filter(Post.author_id == author_id, Post.status == "published")
+        .options(selectinload(Post.tags))
+        .where(Post.author_id == author_id, Post.status == "published")
     )
-    total = query.count()
-    results = query.order_by(desc(Post.created_at)).offset(skip).limit(limit).all()
-    return results, total
+    total, total_is_exact = await count_rows(db, query)
+    results = await _paginate(db, query, skip, limit, cursor)
+    return results, total, total_is_exact
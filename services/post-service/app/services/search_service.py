@@ -0,0 +1,63 @@
+from typing import Optional
+from sqlalchemy import Select, cast, func, literal_column
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from app.models import Post
+from app.config import get_settings
+
+settings = get_settings()
+
+# ts_headline options for the snippet returned alongside each search hit
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15"
+
+# HTML special characters and their escapes; "&" must come first
+HTML_ESCAPES = [("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;")]
+
+
+def _text_config():
+    return cast(settings.SEARCH_TEXT_CONFIG, REGCONFIG)
+
+
+def _html_escape(value):
+    for char, escaped in HTML_ESCAPES:
+        value = func.replace(value, char, escaped)
+    return value
+
+
+def build_search_vector(
+    title: Optional[str], summary: Optional[str], content: Optional[str]
+):
+    """SQL expression for a post's weighted tsvector (title > summary > content)."""
+
+    def weighted(value: Optional[str], weight: str):
+        vector = func.to_tsvector(_text_config(), func.coalesce(value, ""))
+        return func.setweight(vector, literal_column(f"'{weight}'"))
+
+    return (
+        weighted(title, "A")
+        .op("||")(weighted(summary, "B"))
+        .op("||")(weighted(content, "C"))
+    )
+
+
+def apply_full_text_search(query: Select, search: str) -> tuple:
+    """Filter ``query`` to posts matching ``search``.
+
+    Returns ``(query, rank, snippet)`` where ``rank`` is a ts_rank expression
+    to order by and ``snippet`` an HTML excerpt of the post content: the
+    content is escaped, so the only markup is the <mark> around matches.
+    """
+    config = _text_config()
+    tsquery = func.websearch_to_tsquery(config, search)
+    rank = func.ts_rank(Post.search_vector, tsquery)
+    snippet = func.ts_headline(
+        config, _html_escape(Post.content), tsquery, HEADLINE_OPTIONS
+    )
+    return query.where(Post.search_vector.op("@@")(tsquery)), rank, snippet
+
+
+def apply_legacy_search(query: Select, search: str) -> Select:
+    """ILIKE substring match over title and content (pre full-text behavior)."""
+    search_pattern = f"%{search}%"
+    return query.where(
+        (Post.title.ilike(search_pattern)) | (Post.content.ilike(search_pattern))
+    )
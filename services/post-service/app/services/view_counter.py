@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import threading
+import uuid
+from collections import Counter
+from sqlalchemy import Integer, column, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from app.database import SessionLocal
+from app.models import Post
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class ViewCounter:
+    """Aggregates post views in memory and writes them out in bulk.
+
+    Each page view only bumps an in-process counter; a background task
+    applies all pending increments with a single
+    ``UPDATE ... FROM (VALUES ...)`` statement at most ``max_lag`` seconds
+    after the oldest of them was recorded, or once ``max_pending`` are
+    waiting.
+    """
+
+    def __init__(self, max_lag: float, max_pending: int):
+        self.max_lag = max_lag
+        self.max_pending = max_pending
+        self._pending: Counter = Counter()
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._has_pending = asyncio.Event()
+        self._flush_requested = asyncio.Event()
+        self._stopping = False
+
+    def record(self, post_id: uuid.UUID) -> None:
+        with self._lock:
+            first = self._pending_total == 0
+            self._pending[post_id] += 1
+            self._pending_total += 1
+            lagging = self._pending_total >= self.max_pending
+        if first:
+            self._has_pending.set()
+        if lagging:
+            self._flush_requested.set()
+
+    def _drain(self) -> Counter:
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._pending_total = 0
+        return pending
+
+    def _restore(self, pending: Counter) -> None:
+        with self._lock:
+            self._pending.update(pending)
+            self._pending_total += sum(pending.values())
+        self._has_pending.set()
+
+    async def flush(self) -> int:
+        """Write pending increments to the database. Returns posts updated."""
+        pending = self._drain()
+        if not pending:
+            return 0
+
+        increments = values(
+            column("post_id", PGUUID(as_uuid=True)),
+            column("delta", Integer),
+            name="increments",
+        ).data(list(pending.items()))
+        stmt = (
+            update(Post)
+            .where(Post.id == increments.c.post_id)
+            .values(
+                view_count=Post.view_count + increments.c.delta,
+                # A view is not an edit; keep onupdate from touching updated_at
+                updated_at=Post.updated_at,
+            )
+        )
+
+        async with SessionLocal() as db:
+            try:
+                await db.execute(stmt)
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                self._restore(pending)
+                logger.error(f"Error flushing view counts: {e}")
+                return 0
+        return len(pending)
+
+    async def run(self) -> None:
+        """Flush once a view has waited max_lag, or max_pending have piled up."""
+        while not self._stopping:
+            await self._has_pending.wait()
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.max_lag
+                )
+            except asyncio.TimeoutError:
+                pass
+            # Cleared before draining, so a view recorded after the drain
+            # starts the next wait
+            self._has_pending.clear()
+            self._flush_requested.clear()
+            await self.flush()
+
+    def stop(self) -> None:
+        """
+        Make run() flush what it has and return. Used instead of cancelling
+        it, which could interrupt a flush and lose the views it had drained.
+        """
+        self._stopping = True
+        self._has_pending.set()
+        self._flush_requested.set()
+
+
+view_counter = ViewCounter(
+    max_lag=settings.VIEW_FLUSH_MAX_LAG_SECONDS,
+    max_pending=settings.VIEW_FLUSH_MAX_PENDING,
+)
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import users
-from app.database import Base, engine
+from app.database import Base, engine, pool_metrics
+from app.services.token_cache import token_cache, run_jwks_refresher
+import asyncio
 import logging
 
 logging.basicConfig(
@@ -29,15 +31,20 @@ app.add_middleware(
 async def startup_event():
     logger.info("Starting up User Service...")
     try:
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created/verified")
     except Exception as e:
         logger.error(f"Error creating tables: {e}")
 
+    app.state.jwks_refresher = asyncio.create_task(run_jwks_refresher())
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down User Service...")
+    app.state.jwks_refresher.cancel()
+    await engine.dispose()
 
 
 @app.get("/health")
@@ -45,6 +52,16 @@ async def health_check():
     return {"status": "healthy", "service": "user-service"}
 
 
+@app.get("/metrics/pool")
+async def get_pool_metrics():
+    return {"service": "user-service", **pool_metrics()}
+
+
+@app.get("/metrics/auth")
+async def get_auth_metrics():
+    return {"service": "user-service", **token_cache.metrics()}
+
+
 app.include_router(users.router, prefix="/users")
 
 if __name__ == "__main__":
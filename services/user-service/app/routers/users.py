@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, Form
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 import httpx
 import uuid
@@ -32,7 +33,8 @@ from app.services.s3_service import (
     validate_avatar_file,
 )
 from app.config import get_settings
-from jose import jwt, JWTError
+from app.services.token_cache import token_cache
+from jose import JWTError
 
 router = APIRouter(tags=["Users"])
 security = HTTPBearer()
@@ -41,9 +43,7 @@ settings = get_settings()
 
 def get_current_user_id(token: str) -> uuid.UUID:
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = token_cache.decode(token)
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -61,10 +61,12 @@ async def search_user_profiles(
     q: str = Query(..., min_length=1, description="Search query"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     skip = (page - 1) * limit
-    profiles, total = search_profiles(db, q, skip=skip, limit=limit)
+    profiles, total, total_is_exact = await search_profiles(
+        db, q, skip=skip, limit=limit
+    )
     total_pages = (total + limit - 1) // limit
 
     return APIResponse(
@@ -84,6 +86,7 @@ async def search_user_profiles(
             ],
             "pagination": {
                 "total": total,
+                "total_is_exact": total_is_exact,
                 "page": page,
                 "limit": limit,
                 "total_pages": total_pages,
@@ -100,10 +103,10 @@ async def search_user_profiles(
 async def list_profiles(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     skip = (page - 1) * limit
-    profiles, total = get_all_profiles(db, skip=skip, limit=limit)
+    profiles, total, total_is_exact = await get_all_profiles(db, skip=skip, limit=limit)
     total_pages = (total + limit - 1) // limit
 
     return APIResponse(
@@ -123,6 +126,7 @@ async def list_profiles(
             ],
             "pagination": {
                 "total": total,
+                "total_is_exact": total_is_exact,
                 "page": page,
                 "limit": limit,
                 "total_pages": total_pages,
@@ -137,9 +141,9 @@ async def list_profiles(
 
 @router.get("/profiles/{username}", response_model=APIResponse)
 async def get_profile_by_username_endpoint(
-    username: str, db: Session = Depends(get_db)
+    username: str, db: AsyncSession = Depends(get_db)
 ):
-    profile = get_profile_by_username(db, username)
+    profile = await get_profile_by_username(db, username)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
@@ -163,23 +167,23 @@ async def get_profile_by_username_endpoint(
 async def create_user_profile(
     profile_data: UserProfileCreate,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     token = credentials.credentials
     user_id = get_current_user_id(token)
 
     # Check if profile already exists
-    existing_profile = get_profile_by_user_id(db, user_id)
+    existing_profile = await get_profile_by_user_id(db, user_id)
     if existing_profile:
         raise HTTPException(
             status_code=400, detail="Profile already exists for this user"
         )
 
     # Check if username is taken
-    if username_exists(db, profile_data.username):
+    if await username_exists(db, profile_data.username):
         raise HTTPException(status_code=400, detail="Username already taken")
 
-    profile = create_profile(db, user_id, profile_data)
+    profile = await create_profile(db, user_id, profile_data)
 
     return APIResponse(
         success=True,
@@ -201,12 +205,12 @@ async def create_user_profile(
 async def update_user_profile(
     profile_data: UserProfileUpdate,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     token = credentials.credentials
     user_id = get_current_user_id(token)
 
-    profile = update_profile(db, user_id, profile_data)
+    profile = await update_profile(db, user_id, profile_data)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
@@ -229,12 +233,12 @@ async def update_user_profile(
 @router.delete("/profiles/me", response_model=APIResponse)
 async def delete_user_profile(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     token = credentials.credentials
     user_id = get_current_user_id(token)
 
-    deleted = delete_profile(db, user_id)
+    deleted = await delete_profile(db, user_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Profile not found")
 
@@ -246,16 +250,16 @@ async def delete_user_profile(
 @router.get("/me", response_model=APIResponse)
 async def get_my_profile(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     token = credentials.credentials
     user_id = get_current_user_id(token)
 
-    profile = get_profile_by_user_id(db, user_id)
+    profile = await get_profile_by_user_id(db, user_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    avatar_url = get_avatar_url(str(user_id))
+    avatar_url = await run_in_threadpool(get_avatar_url, str(user_id))
 
     return APIResponse(
         success=True,
@@ -285,7 +289,8 @@ async def get_presigned_upload_url(
     if not is_valid:
         raise HTTPException(status_code=400, detail=error_message)
 
-    result = generate_presigned_upload_url(
+    result = await run_in_threadpool(
+        generate_presigned_upload_url,
         user_id=str(user_id),
         content_type=content_type,
         expires_in=settings.S3_AVATAR_EXPIRATION,
@@ -303,19 +308,19 @@ async def get_presigned_upload_url(
 async def update_avatar(
     key: str = Form(...),
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     token = credentials.credentials
     user_id = get_current_user_id(token)
 
-    profile = get_profile_by_user_id(db, user_id)
+    profile = await get_profile_by_user_id(db, user_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
     avatar_url = f"https://{settings.S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
 
     profile_update = UserProfileUpdate(avatar_url=avatar_url)
-    updated_profile = update_profile(db, user_id, profile_update)
+    updated_profile = await update_profile(db, user_id, profile_update)
 
     return APIResponse(
         success=True,
@@ -336,19 +341,19 @@ async def update_avatar(
 @router.delete("/avatars/me", response_model=APIResponse)
 async def delete_avatar_endpoint(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     token = credentials.credentials
     user_id = get_current_user_id(token)
 
-    profile = get_profile_by_user_id(db, user_id)
+    profile = await get_profile_by_user_id(db, user_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    delete_avatar(str(user_id))
+    await run_in_threadpool(delete_avatar, str(user_id))
 
     profile_update = UserProfileUpdate(avatar_url=None)
-    update_profile(db, user_id, profile_update)
+    await update_profile(db, user_id, profile_update)
 
     return APIResponse(
         success=True,
@@ -1,25 +1,33 @@
 from typing import Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import UserProfile
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from app.models import UserProfile, ProfileEvent
 from app.schemas import UserProfileCreate, UserProfileUpdate
+from app.services.count_service import count_rows
 import uuid
 
+# Profile fields other services keep denormalized copies of
+SHARED_FIELDS = {"username", "display_name", "avatar_url"}
 
-def get_profile_by_user_id(db: Session, user_id: uuid.UUID) -> Optional[UserProfile]:
-    return db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+
+async def get_profile_by_user_id(
+    db: AsyncSession, user_id: uuid.UUID
+) -> Optional[UserProfile]:
+    return await db.scalar(select(UserProfile).where(UserProfile.user_id == user_id))
 
 
-def get_profile_by_username(db: Session, username: str) -> Optional[UserProfile]:
-    return (
-        db.query(UserProfile)
-        .filter(func.lower(UserProfile.username) == func.lower(username))
-        .first()
+async def get_profile_by_username(
+    db: AsyncSession, username: str
+) -> Optional[UserProfile]:
+    return await db.scalar(
+        select(UserProfile).where(
+            func.lower(UserProfile.username) == func.lower(username)
+        )
     )
 
 
-def create_profile(
-    db: Session, user_id: uuid.UUID, profile_data: UserProfileCreate
+async def create_profile(
+    db: AsyncSession, user_id: uuid.UUID, profile_data: UserProfileCreate
 ) -> UserProfile:
     profile = UserProfile(
         user_id=user_id,
@@ -29,74 +37,66 @@ def create_profile(
         avatar_url=profile_data.avatar_url,
     )
     db.add(profile)
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
     return profile
 
 
-def update_profile(
-    db: Session, user_id: uuid.UUID, profile_data: UserProfileUpdate
+async def update_profile(
+    db: AsyncSession, user_id: uuid.UUID, profile_data: UserProfileUpdate
 ) -> Optional[UserProfile]:
-    profile = get_profile_by_user_id(db, user_id)
+    profile = await get_profile_by_user_id(db, user_id)
     if not profile:
         return None
 
     update_data = profile_data.dict(exclude_unset=True)
+    changed = {f for f, v in update_data.items() if getattr(profile, f) != v}
     for field, value in update_data.items():
         setattr(profile, field, value)
 
-    db.commit()
-    db.refresh(profile)
+    if changed & SHARED_FIELDS:
+        db.add(ProfileEvent(user_id=user_id, event_type="profile.updated"))
+    await db.commit()
+    await db.refresh(profile)
     return profile
 
 
-def delete_profile(db: Session, user_id: uuid.UUID) -> bool:
-    profile = get_profile_by_user_id(db, user_id)
+async def delete_profile(db: AsyncSession, user_id: uuid.UUID) -> bool:
+    profile = await get_profile_by_user_id(db, user_id)
     if not profile:
         return False
 
-    db.delete(profile)
-    db.commit()
+    await db.delete(profile)
+    db.add(ProfileEvent(user_id=user_id, event_type="profile.deleted"))
+    await db.commit()
     return True
 
 
-def search_profiles(db: Session, query: str, skip: int = 0, limit: int = 20):
+async def search_profiles(db: AsyncSession, query: str, skip: int = 0, limit: int = 20):
     search = f"%{query}%"
-    profiles = (
-        db.query(UserProfile)
-        .filter(
-            (UserProfile.username.ilike(search))
-            | (UserProfile.display_name.ilike(search))
-        )
-        .offset(skip)
-        .limit(limit)
-        .all()
+    matches = select(UserProfile).where(
+        (UserProfile.username.ilike(search)) | (UserProfile.display_name.ilike(search))
     )
+    profiles = (await db.scalars(matches.offset(skip).limit(limit))).all()
+    total, total_is_exact = await count_rows(db, matches)
 
-    total = (
-        db.query(UserProfile)
-        .filter(
-            (UserProfile.username.ilike(search))
-            | (UserProfile.display_name.ilike(search))
-        )
-        .count()
-    )
+    return profiles, total, total_is_exact
 
-    return profiles, total
 
-
-def get_all_profiles(db: Session, skip: int = 0, limit: int = 20):
-    profiles = db.query(UserProfile).offset(skip).limit(limit).all()
-    total = db.query(UserProfile).count()
-    return profiles, total
+async def get_all_profiles(db: AsyncSession, skip: int = 0, limit: int = 20):
+    profiles = (await db.scalars(select(UserProfile).offset(skip).limit(limit))).all()
+    total, total_is_exact = await count_rows(
+        db, select(UserProfile), table="users.profiles"
+    )
+    return profiles, total, total_is_exact
 
 
-def username_exists(
-    db: Session, username: str, exclude_user_id: Optional[uuid.UUID] = None
+async def username_exists(
+    db: AsyncSession, username: str, exclude_user_id: Optional[uuid.UUID] = None
 ) -> bool:
-    query = db.query(UserProfile).filter(
+    query = select(UserProfile.user_id).where(
         func.lower(UserProfile.username) == func.lower(username)
     )
     if exclude_user_id:
-        query = query.filter(UserProfile.user_id != exclude_user_id)
-    return query.first() is not None
+        query = query.where(UserProfile.user_id != exclude_user_id)
+    return (await db.execute(query)).first() is not None